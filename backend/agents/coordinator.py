@@ -3,7 +3,7 @@ Booking Coordinator agent: produces booking-ready options with links and contact
 """
 
 from state import (
-    BookingOption,
+    BookingRecord,
     DecisionLogEntry,
     GraphState,
 )
@@ -15,11 +15,11 @@ def coordinate_bookings(state: GraphState) -> GraphState:
     """
     researched = state.get("researched_data")
 
-    options: list[BookingOption] = []
+    options: list[BookingRecord] = []
     if researched:
         for f in researched.flights:
             options.append(
-                BookingOption(
+                BookingRecord(
                     type="flight",
                     label=f"{f.origin} → {f.destination}",
                     details={"departure": f.departure, "carrier": f.carrier},
@@ -30,7 +30,7 @@ def coordinate_bookings(state: GraphState) -> GraphState:
             )
         for h in researched.hotels:
             options.append(
-                BookingOption(
+                BookingRecord(
                     type="hotel",
                     label=h.name,
                     details={"address": h.address, "rating": h.rating},
@@ -43,7 +43,7 @@ def coordinate_bookings(state: GraphState) -> GraphState:
             )
         for a in researched.activities:
             options.append(
-                BookingOption(
+                BookingRecord(
                     type="activity",
                     label=a.name,
                     details={"duration_minutes": a.duration_minutes, "type": a.type},
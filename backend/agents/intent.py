@@ -1,84 +1,134 @@
 """
 Intent Parser agent: extracts structured intent from natural language.
-Uses simple regex and keyword matching; can be replaced with LLM later.
+Tier 1 is regex and keyword matching with a per-field confidence; only low-confidence
+inputs escalate to the (cached, micro-batched) model tier in agents/intent_model.py.
 """
 
 import re
-from typing import Optional
+from typing import Any, NamedTuple, Optional
 
+from langchain_core.runnables import RunnableConfig
+
+from runtime import get_configurable
 from state import (
     DecisionLogEntry,
     GraphState,
     ParsedIntent,
 )
 
+# Fields whose rule confidence decides escalation; style/interests have harmless defaults
+ESCALATION_FIELDS = ("destination", "origin", "budget_total", "num_days")
+ESCALATION_THRESHOLD = 0.6
+# Multi-word capture that is not a known place ("go somewhere in the hills"): found, but doubtful
+UNKNOWN_PHRASE_CONFIDENCE = 0.3
+
+
+class Extraction(NamedTuple):
+    """
+    Extracted value with the rule path's confidence in it.
+    0.0 means the field is absent from the input; anything below the threshold means it is ambiguous.
+    """
+
+    value: Any
+    confidence: float
+
+
+_MISSING = Extraction(None, 0.0)
+
+# Vague regions expand into a shortlist that is researched in parallel and ranked
+REGION_SHORTLISTS = {
+    "hills": ["Manali", "Shimla", "Darjeeling", "Rishikesh"],
+    "mountains": ["Manali", "Leh", "Shimla", "Darjeeling"],
+    "beach": ["Goa", "Kerala"],
+    "backwaters": ["Alleppey", "Kerala", "Munnar"],
+    "heritage": ["Jaipur", "Udaipur", "Varanasi"],
+}
+MAX_SHORTLIST = 4
+
 
-def _extract_destination(text: str) -> Optional[str]:
+KNOWN_DESTINATIONS = {"goa", "manali", "rishikesh", "kerala", "mumbai", "delhi", "jaipur", "udaipur", "coorg", "leh", "shimla", "darjeeling", "varanasi", "alleppey", "munnar"}
+
+
+def _extract_destination(text: str) -> Extraction:
     """Extract destination from phrases like 'trip to X', 'in X', 'visit X', 'Goa'."""
     if not text or not text.strip():
-        return None
+        return _MISSING
     t = text.strip()
+    words = re.split(r"[\s,?!.]+", t)
+    # Known place names as single word (e.g. "Goa", "Manali", "Kerala")
+    known = next((w.title() for w in words if len(w) > 2 and w.lower() in KNOWN_DESTINATIONS), None)
     # "trip to Goa", "to Rishikesh", "visit Manali", "in Kerala", "around Coorg", "go to Goa"
-    for pattern in [
-        r"\b(?:trip\s+to|visit|go\s+to|to)\s+([A-Za-z][A-Za-z\s]{1,30}?)(?:\s+trip|\s+under|\s+from|\s+next|,|$)",
-        r"\b(?:in|around)\s+([A-Za-z][A-Za-z\s]{1,30}?)(?:\s+under|\s+from|,|$)",
-        r"\b([A-Za-z][a-z]+)\s+trip\b",
+    for pattern, confidence in [
+        (r"\b(?:trip\s+to|visit|go\s+to|to)\s+([A-Za-z][A-Za-z\s]{1,30}?)(?:\s+trip|\s+under|\s+from|\s+next|,|$)", 0.8),
+        (r"\b(?:in|around)\s+([A-Za-z][A-Za-z\s]{1,30}?)(?:\s+under|\s+from|,|$)", 0.5),
+        (r"\b([A-Za-z][a-z]+)\s+trip\b", 0.4),
     ]:
         m = re.search(pattern, t, re.IGNORECASE)
         if m:
-            return m.group(1).strip()
-    # Known place names as single word (e.g. "Goa", "Manali", "Kerala")
-    known = {"goa", "manali", "rishikesh", "kerala", "mumbai", "delhi", "jaipur", "udaipur", "coorg", "leh", "shimla", "darjeeling", "varanasi", "alleppey", "munnar"}
-    words = re.split(r"[\s,]+", t)
-    for w in words:
-        wc = w.strip()
-        if len(wc) > 2 and wc.lower() in known:
-            return wc.title()
+            value = m.group(1).strip()
+            if value.lower() in KNOWN_DESTINATIONS:
+                return Extraction(value.title(), 0.95)
+            if known:
+                break
+            if " " in value:
+                confidence = min(confidence, UNKNOWN_PHRASE_CONFIDENCE)
+            return Extraction(value, confidence)
+    if known:
+        return Extraction(known, 0.9)
     # First capitalized word that looks like a place name
     for w in words:
-        wc = w.strip()
-        if len(wc) > 2 and wc[0].isupper() and wc.isalpha():
-            return wc
-    return None
+        if len(w) > 2 and w[0].isupper() and w.isalpha():
+            return Extraction(w, 0.3)
+    return _MISSING
 
 
-def _extract_origin(text: str) -> Optional[str]:
-    """Extract origin from 'from X'."""
-    m = re.search(r"\bfrom\s+([A-Za-z][A-Za-z\s]{1,20}?)(?:\s+next|,|$)", text, re.IGNORECASE)
-    if m:
-        return m.group(1).strip()
-    return None
+def _extract_origin(text: str) -> Extraction:
+    """Extract origin from 'from X', up to the next clause ('under 30000', 'for 5 days', ...)."""
+    m = re.search(
+        r"\bfrom\s+([A-Za-z][A-Za-z\s]{1,20}?)"
+        r"(?:\s+(?:under|for|to|next|budget|within|with|on|in|by|rs)\b|\s+[0-9₹]|\s*[,.?!]|$)",
+        text,
+        re.IGNORECASE,
+    )
+    if not m:
+        return _MISSING
+    value = m.group(1).strip()
+    if value.lower() in KNOWN_DESTINATIONS:
+        return Extraction(value.title(), 0.95)
+    return Extraction(value, UNKNOWN_PHRASE_CONFIDENCE if " " in value else 0.9)
 
 
-def _extract_budget(text: str) -> Optional[float]:
+def _to_amount(number: str, suffix: Optional[str]) -> float:
+    """'15' + 'k' -> 15000.0; '15,000' -> 15000.0."""
+    val = float(number.replace(",", ""))
+    return val * 1000 if suffix and suffix.lower() == "k" and val < 1000 else val
+
+
+def _extract_budget(text: str) -> Extraction:
     """Extract budget number (INR). Handles ₹15,000, under 20000, 15k, etc."""
     # ₹15,000 or ₹15000 or Rs 20000
-    m = re.search(r"₹?\s*Rs\.?\s*([0-9,]+)\s*(?:k|K|INR)?", text, re.IGNORECASE)
+    m = re.search(r"(?:₹|\bRs\.?)\s*([0-9][0-9,]*)\s*(k\b)?", text, re.IGNORECASE)
     if m:
-        return float(m.group(1).replace(",", ""))
-    m = re.search(r"(?:under|budget|within)\s*[₹\s]*([0-9,]+)\s*(?:k|K|INR|Rs)?", text, re.IGNORECASE)
+        return Extraction(_to_amount(m.group(1), m.group(2)), 0.95)
+    m = re.search(r"(?:under|budget|within)\s*[₹\s]*([0-9][0-9,]*)\s*(k\b)?", text, re.IGNORECASE)
     if m:
-        return float(m.group(1).replace(",", ""))
-    m = re.search(r"([0-9,]+)\s*(?:k|K)\b", text, re.IGNORECASE)
+        return Extraction(_to_amount(m.group(1), m.group(2)), 0.85)
+    m = re.search(r"([0-9][0-9,]*)\s*(k)\b", text, re.IGNORECASE)
     if m:
-        val = float(m.group(1).replace(",", ""))
-        return val * 1000 if val < 1000 else val
-    return None
+        return Extraction(_to_amount(m.group(1), m.group(2)), 0.7)
+    return _MISSING
 
 
-def _extract_num_days(text: str) -> Optional[int]:
+def _extract_num_days(text: str) -> Extraction:
     """Extract number of days."""
     m = re.search(r"(\d+)\s*[-]?\s*day", text, re.IGNORECASE)
     if m:
-        return min(max(1, int(m.group(1))), 30)
-    m = re.search(r"(?:for\s+)?(\d+)\s+days?", text, re.IGNORECASE)
-    if m:
-        return min(max(1, int(m.group(1))), 30)
+        return Extraction(min(max(1, int(m.group(1))), 30), 0.95)
     if re.search(r"\bweekend\b", text, re.IGNORECASE):
-        return 2
+        return Extraction(2, 0.8)
     if re.search(r"\bweek\b", text, re.IGNORECASE):
-        return 7
-    return None
+        return Extraction(7, 0.7)
+    return _MISSING
 
 
 def _extract_travel_style(text: str) -> Optional[str]:
@@ -116,43 +166,95 @@ def _extract_interests(text: str) -> list[str]:
     return interests if interests else []
 
 
-def parse_intent(state: GraphState) -> GraphState:
+def _extract_region_shortlist(text: str) -> list[str]:
+    """Candidate destinations for vague phrases like 'somewhere in the hills' or 'a beach trip'."""
+    t = text.lower()
+    for region, candidates in REGION_SHORTLISTS.items():
+        if re.search(rf"\b{region.rstrip('s')}(?:s|es)?\b", t):
+            return list(candidates)
+    return []
+
+
+def rule_extract(text: str) -> dict[str, Extraction]:
+    """Tier 1: run every rule extractor and return value + confidence per field."""
+    return {
+        "destination": _extract_destination(text),
+        "origin": _extract_origin(text),
+        "budget_total": _extract_budget(text),
+        "num_days": _extract_num_days(text),
+    }
+
+
+def needs_escalation(fields: dict[str, Extraction], threshold: float = ESCALATION_THRESHOLD) -> bool:
+    """
+    True when an escalation field was found but is ambiguous, or no destination was found at all.
+    Other absent fields are simply not stated, so the model cannot fill them either; they take defaults.
+    """
+    if fields["destination"].confidence == 0.0:
+        return True
+    return any(0.0 < fields[name].confidence < threshold for name in ESCALATION_FIELDS)
+
+
+async def parse_intent(state: GraphState, config: RunnableConfig) -> GraphState:
     """
     Parse user input into structured intent (budget, dates, origin, style, interests).
-    Uses simple extraction; replace with LLM for better accuracy.
+    Rules first; low-confidence fields are filled from the model tier when one is configured,
+    and anything still missing falls back to the defaults.
     """
     user_input = (state.get("user_input") or "").strip()
-    if not user_input:
-        user_input = ""
 
-    destination = _extract_destination(user_input)
-    origin = _extract_origin(user_input)
-    budget_total = _extract_budget(user_input)
-    num_days = _extract_num_days(user_input)
+    fields = rule_extract(user_input)
+    vague_destination = fields["destination"].confidence < ESCALATION_THRESHOLD
     travel_style = _extract_travel_style(user_input)
     interests = _extract_interests(user_input)
 
+    tier = "rules"
+    intent_model = get_configurable(config, "intent_model")  # None when no model backend is configured
+    if intent_model is not None and needs_escalation(fields):
+        try:
+            model_fields = await intent_model.extract(user_input)
+        except Exception:  # model tier is best-effort; rules + defaults still produce a plan
+            model_fields = {}
+            tier = "rules_model_failed"
+        else:
+            tier = "model"
+        for name, extraction in fields.items():
+            value = model_fields.get(name)
+            if value is not None and extraction.confidence < ESCALATION_THRESHOLD:
+                fields[name] = Extraction(value, intent_model.confidence)
+
+    shortlist = _extract_region_shortlist(user_input) if vague_destination else []
+    if shortlist:
+        chosen = fields["destination"].value if fields["destination"].confidence >= ESCALATION_THRESHOLD else None
+        shortlist = ([chosen] if chosen else []) + [d for d in shortlist if d != chosen]
+        shortlist = shortlist[:MAX_SHORTLIST]
+
     parsed = ParsedIntent(
-        budget_total=budget_total or 15000.0,
+        budget_total=fields["budget_total"].value or 15000.0,
         currency="INR",
-        origin=origin or "Delhi",
-        destination=destination or "Rishikesh",
-        num_days=num_days or 4,
+        origin=fields["origin"].value or "Delhi",
+        destination=(shortlist[0] if shortlist else fields["destination"].value) or "Rishikesh",
+        num_days=fields["num_days"].value or 4,
         travel_style=travel_style or "solo_backpacking",
         interests=interests or ["adventure", "spiritual"],
+        interests_defaulted=not interests,
         constraints=[],
     )
 
     new_entry = DecisionLogEntry(
         agent="intent_parser",
         step="parse",
-        message=f"Parsed from input: budget={parsed.budget_total} {parsed.currency}, "
+        message=f"Parsed from input ({tier}): budget={parsed.budget_total} {parsed.currency}, "
         f"origin={parsed.origin}, destination={parsed.destination}, days={parsed.num_days}",
-        data=parsed.model_dump(),
+        data={
+            **parsed.model_dump(),
+            "tier": tier,
+            "confidence": {name: extraction.confidence for name, extraction in fields.items()},
+        },
     )
 
     return {
         "parsed_intent": parsed,
-        "destination_shortlist": [parsed.destination] if parsed.destination else [],
+        "destination_shortlist": shortlist or [parsed.destination],
         "decision_log": [new_entry],
     }
@@ -0,0 +1,148 @@
+"""
+Model tier for intent parsing: pluggable backends behind a cache and a micro-batcher.
+Only inputs the rule parser is unsure about reach this tier (see agents/intent.py).
+"""
+
+import asyncio
+import os
+import re
+from collections import OrderedDict
+from typing import Any, Optional, Protocol
+
+from pydantic import BaseModel, Field
+
+
+class IntentFields(BaseModel):
+    """Fields the model tier may fill; None means 'not stated in the input'."""
+
+    destination: Optional[str] = Field(None, description="Destination city or region")
+    origin: Optional[str] = Field(None, description="Departure city")
+    budget_total: Optional[float] = Field(None, description="Total budget in INR")
+    num_days: Optional[int] = Field(None, description="Trip length in days")
+
+
+class IntentModelBackend(Protocol):
+    """Anything that can extract IntentFields-shaped dicts for a batch of inputs."""
+
+    async def extract_batch(self, texts: list[str]) -> list[dict[str, Any]]:
+        ...
+
+
+def normalize_input(text: str) -> str:
+    """Cache key: lowercase, punctuation-insensitive, single-spaced."""
+    return " ".join(re.sub(r"[^\w₹\s]", " ", text.lower()).split())
+
+
+class FakeIntentBackend:
+    """
+    Local backend for tests and benchmarks: canned answers keyed by normalized input,
+    a fixed per-call latency, and a record of batch sizes.
+    """
+
+    def __init__(self, answers: Optional[dict[str, dict[str, Any]]] = None, latency: float = 0.0):
+        self.answers = {normalize_input(k): v for k, v in (answers or {}).items()}
+        self.latency = latency
+        self.batches: list[int] = []
+
+    async def extract_batch(self, texts: list[str]) -> list[dict[str, Any]]:
+        self.batches.append(len(texts))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return [dict(self.answers.get(normalize_input(t), {})) for t in texts]
+
+
+class ChatModelIntentBackend:
+    """LangChain chat model with structured output; one abatch call per micro-batch."""
+
+    def __init__(self, model: Any):
+        self._runnable = model.with_structured_output(IntentFields)
+
+    @classmethod
+    def from_env(cls) -> Optional["ChatModelIntentBackend"]:
+        """OpenAI backend when OPENAI_API_KEY is set, otherwise None (rules only)."""
+        if not os.getenv("OPENAI_API_KEY"):
+            return None
+        from langchain_openai import ChatOpenAI
+
+        return cls(ChatOpenAI(model=os.getenv("INTENT_MODEL", "gpt-4o-mini"), temperature=0))
+
+    async def extract_batch(self, texts: list[str]) -> list[dict[str, Any]]:
+        prompts = [
+            "Extract the trip destination, origin city, total budget in INR and number of days "
+            "from this travel request. If the destination is only described (e.g. 'the backwaters'), "
+            f"name the best-matching place; leave any other field empty if it is not stated.\n\n{t}"
+            for t in texts
+        ]
+        results = await self._runnable.abatch(prompts)
+        return [r.model_dump() if r is not None else {} for r in results]
+
+
+class IntentModel:
+    """
+    Cached, micro-batched front for an IntentModelBackend.
+    Identical inputs (after normalization) share one cache entry and one in-flight call;
+    concurrent misses within batch_window seconds go to the backend as a single batch.
+    """
+
+    def __init__(
+        self,
+        backend: IntentModelBackend,
+        *,
+        cache_size: int = 1024,
+        batch_window: float = 0.01,
+        max_batch: int = 16,
+        confidence: float = 0.8,
+    ):
+        self.backend = backend
+        self.cache_size = cache_size
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.confidence = confidence  # confidence assigned to fields filled by the model
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._pending: list[tuple[str, str]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    async def extract(self, text: str) -> dict[str, Any]:
+        """Model fields for one input; served from cache, an in-flight call, or the next batch."""
+        key = normalize_input(text)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return self._cache[key]
+
+        self.misses += 1
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._inflight[key] = loop.create_future()
+            self._pending.append((key, text))
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._run_batch(batch))
+
+    async def _run_batch(self, batch: list[tuple[str, str]]) -> None:
+        try:
+            results = await self.backend.extract_batch([text for _, text in batch])
+        except Exception as exc:
+            for key, _ in batch:
+                self._inflight.pop(key).set_exception(exc)
+            return
+        results = list(results) + [{}] * (len(batch) - len(results))
+        for (key, _), result in zip(batch, results):
+            self._cache[key] = result
+            self._inflight.pop(key).set_result(result)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
@@ -2,45 +2,76 @@
 Route/Itinerary Planner agent: day-by-day schedule with timings and travel duration.
 """
 
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+
+from runtime import get_configurable
 from state import (
-    DayItem,
+    DayItemRecord,
     DayPlan,
     DecisionLogEntry,
     GraphState,
 )
 
 
-def plan_itinerary(state: GraphState) -> GraphState:
-    """
-    Build day-by-day itinerary; respects travel times and feasibility.
-    """
-    intent = state.get("parsed_intent")
-    num_days = (intent.num_days if intent else None) or 4
-    destination = (intent.destination if intent else None) or "destination"
-
+def build_day_plans(destination: str, num_days: int) -> list[DayPlan]:
+    """Default day-by-day skeleton for a destination (also precomputed for popular routes)."""
     days: list[DayPlan] = []
     for d in range(1, num_days + 1):
-        items: list[DayItem] = []
+        items: list[DayItemRecord] = []
         if d == 1:
             items = [
-                DayItem(time="06:00", title=f"Travel to {destination}", duration_minutes=315, description="Travel"),
-                DayItem(time="12:00", title="Check-in & lunch", duration_minutes=90),
-                DayItem(time="14:00", title=f"Explore {destination}", duration_minutes=180),
-                DayItem(time="18:00", title="Local evening activity", duration_minutes=60),
+                DayItemRecord(time="06:00", title=f"Travel to {destination}", duration_minutes=315, description="Travel"),
+                DayItemRecord(time="12:00", title="Check-in & lunch", duration_minutes=90),
+                DayItemRecord(time="14:00", title=f"Explore {destination}", duration_minutes=180),
+                DayItemRecord(time="18:00", title="Local evening activity", duration_minutes=60),
             ]
         elif d == 2:
             items = [
-                DayItem(time="08:00", title="Main activity", duration_minutes=180, price=1500.0),
-                DayItem(time="12:00", title="Lunch", duration_minutes=60),
-                DayItem(time="14:00", title="Sightseeing / relax", duration_minutes=180),
+                DayItemRecord(time="08:00", title="Main activity", duration_minutes=180, price=1500.0),
+                DayItemRecord(time="12:00", title="Lunch", duration_minutes=60),
+                DayItemRecord(time="14:00", title="Sightseeing / relax", duration_minutes=180),
             ]
         else:
             items = [
-                DayItem(time="09:00", title="Morning activity", duration_minutes=120),
-                DayItem(time="12:00", title="Lunch", duration_minutes=60),
-                DayItem(time="14:00", title=f"Explore {destination}", duration_minutes=240),
+                DayItemRecord(time="09:00", title="Morning activity", duration_minutes=120),
+                DayItemRecord(time="12:00", title="Lunch", duration_minutes=60),
+                DayItemRecord(time="14:00", title=f"Explore {destination}", duration_minutes=240),
             ]
         days.append(DayPlan(day=d, date=None, items=items))
+    return days
+
+
+def _trip(state: GraphState) -> tuple[str, int]:
+    intent = state.get("parsed_intent")
+    num_days = (intent.num_days if intent else None) or 4
+    destination = (intent.destination if intent else None) or "destination"
+    return destination, num_days
+
+
+def warm_skeleton(state: GraphState, config: RunnableConfig) -> dict[str, Any]:
+    """
+    Look up the warm skeleton in the serving process, so an offloaded planner (which gets config=None)
+    receives it in its state slice as "itinerary_skeleton".
+    """
+    warm = get_configurable(config, "warm_cache")  # None when warming is off
+    return {"itinerary_skeleton": warm.get_skeleton(*_trip(state)) if warm else None}
+
+
+def plan_itinerary(state: GraphState, config: RunnableConfig) -> GraphState:
+    """
+    Build day-by-day itinerary; respects travel times and feasibility.
+    Popular destinations reuse the precomputed skeleton from the warm cache.
+    """
+    destination, num_days = _trip(state)
+
+    days = state.get("itinerary_skeleton")  # set when offloaded (see warm_skeleton)
+    if days is None:
+        warm = get_configurable(config, "warm_cache")  # None when warming is off
+        days = warm.get_skeleton(destination, num_days) if warm else None
+    if days is None:
+        days = build_day_plans(destination, num_days)
 
     new_entry = DecisionLogEntry(
         agent="planner",
@@ -0,0 +1,92 @@
+"""
+Destination Ranker agent: scores each researched destination against the parsed intent
+(budget and interests) and picks the best one as the working plan.
+"""
+
+from agents.research import destination_profile
+from state import (
+    DecisionLogEntry,
+    DestinationResearch,
+    DestinationScore,
+    GraphState,
+    ParsedIntent,
+)
+
+BUDGET_WEIGHT = 0.6
+INTEREST_WEIGHT = 0.4
+UNKNOWN_INTEREST_FIT = 0.5  # nothing known about what the place offers: neither rewarded nor penalised
+FOOD_PER_DAY = 800.0  # rough INR/day for meals when estimating trip cost
+
+
+def estimate_cost(item: DestinationResearch, num_days: int) -> float:
+    """Return flight + cheapest stay + activities + food for the trip length."""
+    data = item.researched_data
+    flight = min((f.price or 0.0 for f in data.flights), default=0.0) * 2
+    nights = max(num_days - 1, 1)
+    stay = min((h.price_per_night or 0.0 for h in data.hotels), default=0.0) * nights
+    activities = sum(a.price or 0.0 for a in data.activities)
+    return flight + stay + activities + FOOD_PER_DAY * num_days
+
+
+def score_destination(item: DestinationResearch, intent: ParsedIntent) -> DestinationScore:
+    """
+    Budget fit falls off linearly above budget; interest fit is the share of the user's stated interests
+    the place offers. Default interests (none stated) do not separate candidates, so every place gets 1.0.
+    """
+    num_days = intent.num_days or 4
+    budget = intent.budget_total or 15000.0
+    cost = estimate_cost(item, num_days)
+    budget_fit = 1.0 if cost <= budget else max(0.0, 1.0 - (cost - budget) / budget)
+
+    tags, _ = destination_profile(item.destination)
+    offered = set(tags) | {a.type for a in item.researched_data.activities if a.type}
+    interests = set() if intent.interests_defaulted else set(intent.interests or [])
+    if not interests:
+        interest_fit = 1.0
+    elif not offered:
+        interest_fit = UNKNOWN_INTEREST_FIT
+    else:
+        interest_fit = len(interests & offered) / len(interests)
+
+    return DestinationScore(
+        destination=item.destination,
+        score=round(BUDGET_WEIGHT * budget_fit + INTEREST_WEIGHT * interest_fit, 3),
+        estimated_cost=round(cost, 0),
+        budget_fit=round(budget_fit, 3),
+        interest_fit=round(interest_fit, 3),
+        currency=intent.currency,
+    )
+
+
+def rank_destinations(state: GraphState) -> GraphState:
+    """
+    Merge the parallel research branches into a ranked shortlist.
+    The top destination becomes parsed_intent.destination and its research becomes researched_data.
+    """
+    intent = state.get("parsed_intent") or ParsedIntent()
+    results = state.get("destination_research") or []
+    if not results:
+        return {"ranked_destinations": []}
+
+    # Ties (e.g. several places within budget and no stated interests) go to the cheaper trip
+    ranked = sorted(
+        (score_destination(r, intent) for r in results), key=lambda s: (s.score, -s.estimated_cost), reverse=True
+    )
+    best = ranked[0].destination
+    by_name = {r.destination: r for r in results}
+
+    new_entry = DecisionLogEntry(
+        agent="ranker",
+        step="rank",
+        message="Ranked destinations: "
+        + ", ".join(f"{s.destination} ({s.score:.2f}, ~{s.estimated_cost:,.0f} {s.currency})" for s in ranked),
+        data=None,
+    )
+
+    return {
+        "ranked_destinations": ranked,
+        "destination_shortlist": [s.destination for s in ranked],
+        "researched_data": by_name[best].researched_data,
+        "parsed_intent": intent.model_copy(update={"destination": best}),
+        "decision_log": [new_entry],
+    }
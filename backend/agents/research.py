@@ -1,82 +1,101 @@
 """
 Research Agent: fetches flights, hotels, weather, activities; fills shared state.
+Runs once per shortlisted destination (parallel branches fanned out from the intent node).
 """
 
+from typing import Optional
+
+from langchain_core.runnables import RunnableConfig
+
+from http_client import ProviderClient, get_provider_client
+from providers import fetch_weather, live_weather_enabled
+from runtime import get_configurable
 from state import (
-    ActivityOption,
+    ActivityRecord,
     DecisionLogEntry,
-    FlightOption,
+    DestinationResearch,
+    FlightRecord,
     GraphState,
-    HotelOption,
+    HotelRecord,
     ResearchedData,
     WeatherInfo,
 )
 
+# Demo profiles: what each destination is good for and how pricey it is relative to the baseline
+DESTINATION_PROFILES: dict[str, tuple[list[str], float]] = {
+    "goa": (["beach", "food"], 1.2),
+    "kerala": (["nature", "beach", "food"], 1.1),
+    "alleppey": (["nature", "food"], 1.0),
+    "munnar": (["nature", "adventure"], 0.9),
+    "coorg": (["nature", "food"], 1.0),
+    "manali": (["adventure", "nature"], 1.0),
+    "shimla": (["nature", "culture"], 0.9),
+    "darjeeling": (["nature", "culture"], 0.95),
+    "leh": (["adventure", "nature"], 1.4),
+    "rishikesh": (["adventure", "spiritual"], 1.0),
+    "varanasi": (["spiritual", "culture"], 0.8),
+    "jaipur": (["culture", "food"], 0.9),
+    "udaipur": (["culture", "food"], 1.3),
+    "mumbai": (["food", "culture"], 1.3),
+    "delhi": (["food", "culture"], 1.0),
+}
+DEFAULT_PROFILE: tuple[list[str], float] = ([], 1.0)  # unknown place: claims no interests, baseline prices
 
-def research(state: GraphState) -> GraphState:
-    """
-    Fetch real-world data (flights, hotels, weather, activities).
-    Placeholder: returns demo data; will integrate Amadeus, Open-Meteo, etc.
-    """
-    intent = state.get("parsed_intent")
-    destination = (intent.destination if intent else None) or "Rishikesh"
-    origin = (intent.origin if intent else None) or "Delhi"
 
-    entries = [
-        DecisionLogEntry(
-            agent="research",
-            step="fetch",
-            message=f"Researching destination: {destination} from {origin}",
-            data=None,
-        ),
-    ]
+def destination_profile(destination: str) -> tuple[list[str], float]:
+    """(interest tags, price multiplier) for a destination; neutral profile when unknown."""
+    return DESTINATION_PROFILES.get(destination.strip().lower(), DEFAULT_PROFILE)
 
-    # Demo data when APIs are not configured; labels use parsed intent
-    researched = ResearchedData(
+
+def build_demo_research(origin: str, destination: str) -> ResearchedData:
+    """Demo data used when provider APIs are not configured; labels and prices follow the destination."""
+    tags, cost = destination_profile(destination)
+    map_link = f"https://maps.google.com/?q={destination.replace(' ', '+')}"
+    return ResearchedData(
         flights=[
-            FlightOption(
+            FlightRecord(
                 origin=origin,
                 destination=destination,
                 departure="2025-03-01 06:00",
                 arrival="2025-03-01 07:15",
                 carrier="IndiGo",
-                price=2500.0,
+                price=round(2500.0 * cost, 0),
                 currency="INR",
                 booking_link="https://www.goindigo.in/",
                 is_demo=True,
             )
         ],
         hotels=[
-            HotelOption(
+            HotelRecord(
                 name=f"Stay at {destination}",
                 address=destination,
-                price_per_night=600.0,
+                price_per_night=round(600.0 * cost, 0),
                 currency="INR",
                 rating=4.5,
                 booking_link="https://www.booking.com/",
-                map_link=f"https://maps.google.com/?q={destination.replace(' ', '+')}",
+                map_link=map_link,
                 is_demo=True,
             )
         ],
         activities=[
-            ActivityOption(
+            ActivityRecord(
                 name=f"Top activity in {destination}",
-                type="adventure",
+                type=tags[0] if tags else None,
                 duration_minutes=180,
-                price=1500.0,
+                price=round(1500.0 * cost, 0),
                 currency="INR",
                 booking_link="https://example.com/activities",
-                map_link=f"https://maps.google.com/?q={destination.replace(' ', '+')}",
+                map_link=map_link,
                 is_demo=True,
             ),
-            ActivityOption(
+            ActivityRecord(
                 name=f"Local experience in {destination}",
-                type="spiritual",
+                type=tags[-1] if tags else None,
                 duration_minutes=60,
                 price=0.0,
                 currency="INR",
                 opening_hours="18:00",
-                map_link=f"https://maps.google.com/?q={destination.replace(' ', '+')}",
+                map_link=map_link,
                 is_demo=True,
             ),
         ],
@@ -93,17 +112,69 @@ def research(state: GraphState) -> GraphState:
         local_tips=[f"Book activities in {destination} in advance during peak season."],
     )
 
+
+async def collect_research(
+    origin: str, destination: str, num_days: int, client: Optional[ProviderClient]
+) -> tuple[ResearchedData, Optional[str]]:
+    """Demo data plus live providers where enabled; the note (if any) goes to the decision log."""
+    researched = build_demo_research(origin, destination)
+    if client is None or not live_weather_enabled():
+        return researched, None
+    weather = await fetch_weather(client, destination, days=num_days)
+    if weather:
+        researched.weather = weather
+        return researched, f"Live weather for {destination}: {len(weather)} day(s)."
+    return researched, f"Weather provider unavailable for {destination}; using demo weather."
+
+
+async def research(state: GraphState, config: RunnableConfig) -> GraphState:
+    """
+    Fetch real-world data (flights, hotels, weather, activities) for one destination.
+    The destination comes from the fan-out payload, falling back to the parsed intent.
+    Popular routes are served from the warm cache; otherwise uses the shared provider client
+    for live weather, and demo data for everything else.
+    """
+    intent = state.get("parsed_intent")
+    destination = state.get("destination") or (intent.destination if intent else None) or "Rishikesh"
+    origin = (intent.origin if intent else None) or "Delhi"
+    num_days = (intent.num_days if intent else None) or 4
+
+    entries = [
+        DecisionLogEntry(
+            agent="research",
+            step="fetch",
+            message=f"Researching destination: {destination} from {origin}",
+            data=None,
+        ),
+    ]
+
+    warm = get_configurable(config, "warm_cache")  # None when warming is off
+    researched = warm.get_research(origin, destination, num_days) if warm else None
+    if researched is not None:
+        entries.append(
+            DecisionLogEntry(
+                agent="research",
+                step="warm_cache",
+                message=f"Served {origin} → {destination} from precomputed research.",
+                data=None,
+            )
+        )
+    else:
+        researched, note = await collect_research(origin, destination, num_days, get_provider_client(config))
+        if note:
+            entries.append(DecisionLogEntry(agent="research", step="weather", message=note, data=None))
+
     entries.append(
         DecisionLogEntry(
             agent="research",
             step="complete",
-            message=f"Found {len(researched.flights)} flight(s), {len(researched.hotels)} hotel(s), "
+            message=f"{destination}: found {len(researched.flights)} flight(s), {len(researched.hotels)} hotel(s), "
             f"{len(researched.activities)} activity(ies). Demo data used.",
             data=None,
         )
     )
 
     return {
-        "researched_data": researched,
+        "destination_research": [DestinationResearch(destination=destination, researched_data=researched)],
         "decision_log": entries,
     }
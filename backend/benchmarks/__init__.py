@@ -0,0 +1 @@
+# Benchmarks for the backend; run as modules from backend/ (python -m benchmarks.<name>)
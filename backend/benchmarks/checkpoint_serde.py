@@ -0,0 +1,76 @@
+"""
+Benchmark: encode/decode time and bytes per checkpoint for a full-journey GraphState,
+LangGraph's default JsonPlusSerializer vs. TripStateSerializer.
+
+Run from backend/:  python -m benchmarks.checkpoint_serde
+"""
+
+import time
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from benchmarks.state_memory import build_records
+from checkpointing import TripStateSerializer
+from state import BudgetAllocation, DecisionLogEntry, ParsedIntent
+
+STEPS = 8  # supersteps in a full journey (intent .. coordinator)
+ROUNDS = 50
+
+
+def full_journey_state() -> dict:
+    data = build_records()
+    return {
+        "user_input": "Weekend trip to Goa from Delhi under 20k, beach and food",
+        "parsed_intent": ParsedIntent(budget_total=20000.0, origin="Delhi", destination="Goa", num_days=7,
+                                      travel_style="weekend", interests=["beach", "food"]),
+        "destination_shortlist": ["Goa"],
+        "researched_data": data["researched"],
+        "budget_allocation": BudgetAllocation(transport=4000, stay=5333, food=4667, activities=4667, buffer=1333),
+        "day_by_day_itinerary": data["days"],
+        "booking_options": data["bookings"],
+        "decision_log": [],
+        "current_checkpoint": "itinerary_approved",
+    }
+
+
+def _log_entry(step: int) -> DecisionLogEntry:
+    return DecisionLogEntry(agent="bench", step=f"step{step}", message=f"Step {step} done", data={"step": step})
+
+
+def run(serde) -> dict:
+    """Checkpoint every channel at every step; decision_log grows by one entry per step."""
+    encode = decode = 0.0
+    total_bytes = 0
+    for _ in range(ROUNDS):
+        state = full_journey_state()
+        for step in range(STEPS):
+            state["decision_log"] = state["decision_log"] + [_log_entry(step)]
+            started = time.perf_counter()
+            blobs = [serde.dumps_typed(v) for v in state.values()]
+            encode += time.perf_counter() - started
+            total_bytes += sum(len(b) for _, b in blobs)
+            started = time.perf_counter()
+            for blob in blobs:
+                serde.loads_typed(blob)
+            decode += time.perf_counter() - started
+    checkpoints = ROUNDS * STEPS
+    return {
+        "encode_ms": encode / checkpoints * 1000,
+        "decode_ms": decode / checkpoints * 1000,
+        "bytes": total_bytes / checkpoints,
+    }
+
+
+def main() -> None:
+    results = {
+        "jsonplus (default)": run(JsonPlusSerializer()),
+        "tripstate": run(TripStateSerializer()),
+        "tripstate, no compression": run(TripStateSerializer(compress_threshold=None)),
+    }
+    print(f"{'serializer':28} {'encode ms':>10} {'decode ms':>10} {'bytes/ckpt':>11}")
+    for name, r in results.items():
+        print(f"{name:28} {r['encode_ms']:10.3f} {r['decode_ms']:10.3f} {r['bytes']:11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: escalation rate and average parse latency of the tiered intent parser.
+
+Run from backend/:  python -m benchmarks.intent_escalation
+The model tier is FakeIntentBackend with a fixed latency, so numbers show the cost
+structure (rules vs. escalated vs. cached) rather than any real model's speed.
+"""
+
+import asyncio
+import time
+
+from agents.intent import needs_escalation, parse_intent, rule_extract
+from agents.intent_model import FakeIntentBackend, IntentModel
+
+MODEL_LATENCY = 0.8  # seconds per backend call, roughly a small hosted model
+
+CORPUS = [
+    "Solo trip to Rishikesh from Delhi under ₹15,000 for 4 days, adventure and yoga",
+    "Weekend trip to Goa from Mumbai budget 20k",
+    "Family trip to Kerala for 6 days within Rs 60000",
+    "5-day Manali trek from Chandigarh under 25000",
+    "Honeymoon in Udaipur for 3 days, luxury, ₹80,000",
+    "Visit Jaipur from Delhi for 2 days under 10k, heritage and food",
+    "somewhere in the hills under 20k",
+    "beach holiday next month, not too expensive",
+    "I want to see the backwaters and eat seafood",
+    "Leh Ladakh bike trip for a week from Delhi Rs 45000",
+    "Something spiritual, maybe Varanasi?",
+    "cheap getaway with friends",
+    "somewhere in the hills under 20k",
+    "Darjeeling trip from Kolkata for 4 days under ₹18,000",
+    "Coorg coffee estates weekend",
+    "cheap getaway with friends",
+    "trip to Munnar from Kochi for 3 days budget 12000",
+    "mountains, snow, 5 days",
+    "beach holiday next month, not too expensive",
+    "Shimla trip from Delhi under 15000 for 3 days",
+]
+
+ANSWERS = {
+    "somewhere in the hills under 20k": {"destination": "Manali", "num_days": 4},
+    "beach holiday next month, not too expensive": {"destination": "Goa", "budget_total": 20000.0},
+    "I want to see the backwaters and eat seafood": {"destination": "Alleppey"},
+    "Something spiritual, maybe Varanasi?": {"destination": "Varanasi"},
+    "cheap getaway with friends": {"budget_total": 10000.0, "num_days": 2},
+    "mountains, snow, 5 days": {"destination": "Manali", "num_days": 5},
+}
+
+
+async def _timed_parse(text: str, config: dict) -> float:
+    started = time.perf_counter()
+    await parse_intent({"user_input": text}, config)
+    return time.perf_counter() - started
+
+
+async def main() -> None:
+    escalated = sum(needs_escalation(rule_extract(text)) for text in CORPUS)
+
+    backend = FakeIntentBackend(ANSWERS, latency=MODEL_LATENCY)
+    model = IntentModel(backend)
+    config = {"configurable": {"intent_model": model}}
+
+    # Sequential: every request pays its own way (cache hits for repeated inputs)
+    sequential = [await _timed_parse(text, config) for text in CORPUS]
+
+    # Concurrent burst on a cold cache: escalations share one micro-batch
+    backend_cold = FakeIntentBackend(ANSWERS, latency=MODEL_LATENCY)
+    config_cold = {"configurable": {"intent_model": IntentModel(backend_cold)}}
+    started = time.perf_counter()
+    burst = await asyncio.gather(*(_timed_parse(text, config_cold) for text in CORPUS))
+    burst_wall = time.perf_counter() - started
+
+    always_model = MODEL_LATENCY
+
+    print(f"inputs:                    {len(CORPUS)}")
+    print(f"escalation rate:           {escalated / len(CORPUS):.0%} ({escalated}/{len(CORPUS)})")
+    print(f"sequential avg latency:    {sum(sequential) / len(sequential) * 1000:.1f} ms")
+    print(f"  backend calls:           {len(backend.batches)} (cache hits {model.hits})")
+    print(f"burst avg latency:         {sum(burst) / len(burst) * 1000:.1f} ms, wall {burst_wall * 1000:.1f} ms")
+    print(f"  backend batches:         {backend_cold.batches}")
+    print(f"model-every-request avg:   {always_model * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
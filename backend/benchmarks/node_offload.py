@@ -0,0 +1,101 @@
+"""
+Benchmark: light-request throughput while CPU-heavy planner runs execute, inline vs. in a NodePool.
+
+Run from backend/:  python -m benchmarks.node_offload
+The heavy node is the real planner followed by a brute-force ordering search (a stand-in for the
+scheduling work planned for it). Light requests hit /health on the app through an in-process ASGI transport.
+Inline, the heavy node holds the GIL and light throughput collapses; offloaded it stays near the idle
+rate, and heavy-node throughput scales with pool size up to the number of cores.
+"""
+
+import asyncio
+import itertools
+import os
+import time
+
+import httpx
+from langgraph.graph import END, START, StateGraph
+
+from agents.planner import plan_itinerary
+from main import app
+from offload import NodePool
+from state import GraphState, ParsedIntent
+
+WINDOW = 3.0  # seconds measured per scenario
+LIGHT_CLIENTS = 8
+HEAVY_RUNS = 4  # concurrent graph runs with a heavy node
+SLOTS = 8  # items to order: 8! candidate orderings per run
+
+
+def heavy_planner(state: GraphState, config=None) -> GraphState:
+    """plan_itinerary plus an exhaustive search for the ordering with the least travel between slots."""
+    update = plan_itinerary(state, config)
+    best = min(
+        itertools.permutations(range(SLOTS)),
+        key=lambda order: sum(abs(a - b) * (i + 1) for i, (a, b) in enumerate(zip(order, order[1:]))),
+    )
+    update["decision_log"][0].data = {"order": list(best)}
+    return update
+
+
+def build_graph(pool: NodePool = None):
+    builder = StateGraph(GraphState)
+    builder.add_node("planner", pool.node("planner", heavy_planner, reads=("parsed_intent",)) if pool else heavy_planner)
+    builder.add_edge(START, "planner")
+    builder.add_edge("planner", END)
+    return builder.compile()
+
+
+async def _light_loop(client: httpx.AsyncClient, stop: float) -> int:
+    done = 0
+    while time.perf_counter() < stop:
+        (await client.get("/health")).raise_for_status()
+        done += 1
+    return done
+
+
+async def _heavy_loop(graph, stop: float) -> int:
+    state = {"parsed_intent": ParsedIntent(destination="Goa", num_days=5), "decision_log": []}
+    done = 0
+    while time.perf_counter() < stop:
+        await graph.ainvoke(state)
+        done += 1
+    return done
+
+
+async def scenario(graph=None) -> tuple[float, float]:
+    """(light requests/s, heavy nodes/s) over WINDOW seconds."""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        stop = time.perf_counter() + WINDOW
+        light = [_light_loop(client, stop) for _ in range(LIGHT_CLIENTS)]
+        heavy = [_heavy_loop(graph, stop) for _ in range(HEAVY_RUNS)] if graph else []
+        counts = await asyncio.gather(*light, *heavy)
+    return sum(counts[:LIGHT_CLIENTS]) / WINDOW, sum(counts[LIGHT_CLIENTS:]) / WINDOW
+
+
+async def amain() -> None:
+    cores = os.cpu_count() or 1
+    results = {
+        "idle (no heavy nodes)": await scenario(),
+        "heavy nodes inline": await scenario(build_graph()),
+    }
+    for size in sorted({1, min(cores, HEAVY_RUNS)}):
+        pool = NodePool(size)
+        await pool.start()
+        try:
+            results[f"heavy nodes, pool size {size}"] = await scenario(build_graph(pool))
+        finally:
+            pool.shutdown()
+
+    print(f"cores: {cores}, {LIGHT_CLIENTS} light clients, {HEAVY_RUNS} concurrent heavy runs, {WINDOW:.0f}s each")
+    print(f"{'scenario':28} {'light req/s':>12} {'heavy nodes/s':>14}")
+    for name, (light, heavy) in results.items():
+        print(f"{name:28} {light:12.0f} {heavy:14.1f}")
+
+
+def main() -> None:
+    asyncio.run(amain())
+
+
+if __name__ == "__main__":
+    main()
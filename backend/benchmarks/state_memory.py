@@ -0,0 +1,108 @@
+"""
+Benchmark: resident bytes per thread for a full journey's research, itinerary and booking data,
+with Pydantic leaf models (before) vs. compact NamedTuple records (after).
+
+Run from backend/:  python -m benchmarks.state_memory
+"""
+
+import gc
+import tracemalloc
+
+from state import (
+    ActivityOption,
+    ActivityRecord,
+    BookingOption,
+    BookingRecord,
+    DayItem,
+    DayItemRecord,
+    DayPlan,
+    FlightOption,
+    FlightRecord,
+    HotelOption,
+    HotelRecord,
+    ResearchedData,
+)
+
+# Realistic inventory for one destination
+FLIGHTS, HOTELS, ACTIVITIES, DAYS, ITEMS_PER_DAY = 40, 60, 80, 7, 5
+THREADS = 200
+
+
+def _flight(i: int) -> dict:
+    return dict(origin="Delhi", destination="Goa", departure=f"2025-03-01 {i % 24:02d}:00",
+                arrival=f"2025-03-01 {(i + 2) % 24:02d}:30", carrier="IndiGo", price=2500.0 + i,
+                booking_link=f"https://www.goindigo.in/?f={i}", is_demo=True)
+
+
+def _hotel(i: int) -> dict:
+    return dict(name=f"Hotel {i}", address=f"{i} Beach Road, Goa", price_per_night=1200.0 + i, rating=4.1,
+                booking_link=f"https://www.booking.com/h{i}", map_link=f"https://maps.google.com/?q=Hotel+{i}",
+                contact="+91 98765 43210", is_demo=True)
+
+
+def _activity(i: int) -> dict:
+    return dict(name=f"Activity {i}", type="adventure", duration_minutes=120, price=800.0 + i,
+                booking_link=f"https://example.com/a{i}", map_link=f"https://maps.google.com/?q=A{i}", is_demo=True)
+
+
+def _item(d: int, i: int) -> dict:
+    return dict(time=f"{8 + 2 * i:02d}:00", title=f"Day {d} item {i}", duration_minutes=90,
+                description="Explore the area", location="Goa", price=500.0)
+
+
+def _booking(i: int) -> dict:
+    return dict(type="hotel", label=f"Hotel {i}", details={"address": f"{i} Beach Road", "rating": 4.1},
+                booking_link=f"https://www.booking.com/h{i}", price=1200.0 + i)
+
+
+def build_models() -> dict:
+    """Before: every option and day item is a full Pydantic model instance."""
+    return {
+        "flights": [FlightOption(**_flight(i)) for i in range(FLIGHTS)],
+        "hotels": [HotelOption(**_hotel(i)) for i in range(HOTELS)],
+        "activities": [ActivityOption(**_activity(i)) for i in range(ACTIVITIES)],
+        "days": [[DayItem(**_item(d, i)) for i in range(ITEMS_PER_DAY)] for d in range(DAYS)],
+        "bookings": [BookingOption(**_booking(i)) for i in range(FLIGHTS + HOTELS + ACTIVITIES)],
+    }
+
+
+def build_records() -> dict:
+    """After: the same data as records inside the state containers."""
+    return {
+        "researched": ResearchedData.model_construct(
+            flights=[FlightRecord(**_flight(i)) for i in range(FLIGHTS)],
+            hotels=[HotelRecord(**_hotel(i)) for i in range(HOTELS)],
+            activities=[ActivityRecord(**_activity(i)) for i in range(ACTIVITIES)],
+            weather=[], local_tips=[], raw_notes=None,
+        ),
+        "days": [
+            DayPlan.model_construct(day=d, date=None, travel_notes=None,
+                                    items=[DayItemRecord(**_item(d, i)) for i in range(ITEMS_PER_DAY)])
+            for d in range(DAYS)
+        ],
+        "bookings": [BookingRecord(**_booking(i)) for i in range(FLIGHTS + HOTELS + ACTIVITIES)],
+    }
+
+
+def bytes_per_thread(build) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    threads = [build() for _ in range(THREADS)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del threads
+    return (after - before) / THREADS
+
+
+def main() -> None:
+    models = bytes_per_thread(build_models)
+    records = bytes_per_thread(build_records)
+    print(f"inventory per thread: {FLIGHTS} flights, {HOTELS} hotels, {ACTIVITIES} activities, "
+          f"{DAYS}x{ITEMS_PER_DAY} day items, {FLIGHTS + HOTELS + ACTIVITIES} booking options")
+    print(f"pydantic models: {models / 1024:8.1f} KiB/thread")
+    print(f"compact records: {records / 1024:8.1f} KiB/thread  ({records / models:.0%} of before)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark: server memory per idle WebSocket planning session parked at an approval.
+
+Run from backend/:  python -m benchmarks.ws_sessions
+For each uvicorn configuration, starts the server in a subprocess and opens SESSIONS connections that
+each start a plan and wait at its first approval. Reports the server's resident memory growth per
+parked session, and per plan created over HTTP (checkpointed state, no connection); the difference
+is what the open connection itself costs. Per-message deflate keeps a zlib stream per connection,
+which dominates that cost. Reads RSS from /proc, so Linux only.
+"""
+
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+
+import httpx
+import websockets
+
+SESSIONS = 500
+CONNECT_CONCURRENCY = 50
+PORT = 8765
+USER_INPUT = "Goa trip from Delhi for 3 days under 20k"
+WS_FLAGS = ["--ws-max-size", "65536", "--ws-ping-interval", "30"]  # as in the README
+CONFIGS = {
+    "uvicorn defaults": [],
+    "README flags": WS_FLAGS,
+    "README flags, no deflate": [*WS_FLAGS, "--ws-per-message-deflate", "false"],
+}
+
+
+def _rss_kib(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    raise RuntimeError("VmRSS not found")
+
+
+async def _wait_ready(base: str) -> None:
+    async with httpx.AsyncClient() as client:
+        for _ in range(100):
+            try:
+                (await client.get(f"{base}/health")).raise_for_status()
+                return
+            except httpx.HTTPError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def _park(url: str, slots: asyncio.Semaphore):
+    """Open a session, start a plan and return the connection once it waits at the first approval."""
+    async with slots:
+        ws = await websockets.connect(url, max_size=65536)
+        await ws.send(json.dumps({"type": "start", "user_input": USER_INPUT}))
+        while json.loads(await ws.recv())["type"] not in ("interrupt", "complete", "error"):
+            pass
+        return ws
+
+
+async def _create_over_http(base: str, n: int) -> None:
+    async with httpx.AsyncClient(base_url=base, timeout=30) as client:
+        slots = asyncio.Semaphore(CONNECT_CONCURRENCY)
+
+        async def one():
+            async with slots:
+                (await client.post("/api/plan", json={"user_input": USER_INPUT})).raise_for_status()
+
+        await asyncio.gather(*(one() for _ in range(n)))
+
+
+async def measure(flags: list[str]) -> tuple[float, float]:
+    """(KiB per parked session, KiB per plan created over HTTP) for a server started with flags."""
+    base, url = f"http://127.0.0.1:{PORT}", f"ws://127.0.0.1:{PORT}/api/plan/ws"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(PORT), "--log-level", "warning", *flags],
+        env={**os.environ, "WARM_ENABLED": "0"},
+    )
+    try:
+        await _wait_ready(base)
+        await _create_over_http(base, 20)  # warm imports, graph and allocator pools
+        await (await _park(url, asyncio.Semaphore(1))).close()
+
+        before = _rss_kib(server.pid)
+        slots = asyncio.Semaphore(CONNECT_CONCURRENCY)
+        sockets = await asyncio.gather(*(_park(url, slots) for _ in range(SESSIONS)))
+        await asyncio.sleep(1.0)
+        parked = _rss_kib(server.pid)
+
+        await _create_over_http(base, SESSIONS)
+        plans = _rss_kib(server.pid)
+        for ws in sockets:
+            await ws.close()
+    finally:
+        server.terminate()
+        server.wait()
+    return (parked - before) / SESSIONS, (plans - parked) / SESSIONS
+
+
+async def amain() -> None:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (min(hard, max(soft, 4 * SESSIONS)), hard))
+    results = {name: await measure(flags) for name, flags in CONFIGS.items()}
+
+    print(f"{SESSIONS} idle sessions parked at an approval; server RSS growth in KiB")
+    print(f"{'configuration':26} {'per session':>12} {'per plan':>9} {'per connection':>15}")
+    for name, (per_session, per_plan) in results.items():
+        print(f"{name:26} {per_session:12.1f} {per_plan:9.1f} {per_session - per_plan:15.1f}")
+
+
+def main() -> None:
+    asyncio.run(amain())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Checkpoint persistence: a schema-aware serializer for GraphState values and the checkpointer factory.
+State models and records are msgpack-encoded as positional field arrays (no class paths); each blob
+carries the field names of the types it uses once, so blobs written before a field was added, removed
+or reordered still decode by name. Anything else falls back to LangGraph's default JsonPlusSerializer.
+"""
+
+import os
+import weakref
+import zlib
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional
+
+import ormsgpack
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from pydantic import BaseModel
+
+from state import (
+    ActivityRecord,
+    BookingRecord,
+    BudgetAllocation,
+    DayItemRecord,
+    DayPlan,
+    DecisionLogEntry,
+    DestinationResearch,
+    DestinationScore,
+    FlightRecord,
+    HotelRecord,
+    ParsedIntent,
+    ResearchedData,
+    WeatherInfo,
+)
+
+TYPE_TAG = "tripstate"
+TYPE_TAG_COMPRESSED = "tripstate.z"
+
+# Ext codes are part of the stored format: append new types, never renumber.
+# Fields may be added, removed or reordered (blobs carry their field names), but a new field
+# on a model or record must have a default so older blobs can still be decoded.
+_MODELS: dict[int, type[BaseModel]] = {
+    1: ParsedIntent,
+    2: WeatherInfo,
+    3: ResearchedData,
+    4: BudgetAllocation,
+    5: DayPlan,
+    6: DecisionLogEntry,
+    7: DestinationResearch,
+    8: DestinationScore,
+}
+_RECORDS: dict[int, type] = {
+    10: FlightRecord,
+    11: HotelRecord,
+    12: ActivityRecord,
+    13: DayItemRecord,
+    14: BookingRecord,
+}
+_MODEL_FIELDS = {cls: tuple(cls.model_fields) for cls in _MODELS.values()}
+_CODES = {cls: code for code, cls in (*_MODELS.items(), *_RECORDS.items())}
+_FIELDS = {code: _MODEL_FIELDS[cls] if cls in _MODEL_FIELDS else cls._fields for cls, code in _CODES.items()}
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+
+class _Unsupported(Exception):
+    """Value contains a type this serializer does not know; use the fallback."""
+
+
+class SchemaMismatch(ValueError):
+    """A stored blob cannot be mapped onto the current state types (e.g. a required field was added)."""
+
+
+def _required(cls) -> frozenset[str]:
+    if cls in _MODEL_FIELDS:
+        return frozenset(name for name, field in cls.model_fields.items() if field.is_required())
+    return frozenset(cls._fields) - frozenset(cls._field_defaults)
+
+
+_REQUIRED = {code: _required(cls) for cls, code in _CODES.items()}
+
+
+class TripStateSerializer:
+    """
+    SerializerProtocol implementation for GraphState channel values.
+    Encoded sub-models are memoized by identity, so a ResearchedData or DecisionLogEntry that is carried
+    unchanged from step to step is encoded once and its bytes are reused (nodes never mutate state in place).
+    A blob is [header, value bytes]; the header lists [code, field names] for each type the value uses.
+    Blobs larger than compress_threshold bytes are zlib-compressed.
+    """
+
+    def __init__(self, compress_threshold: Optional[int] = 4096, compress_level: int = 1):
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+        self.fallback = JsonPlusSerializer()
+        # id -> (weakref, encoded Ext, codes used inside it)
+        self._memo: dict[int, tuple[weakref.ref, ormsgpack.Ext, frozenset[int]]] = {}
+
+    # -- encoding
+
+    def _encode(self, value: Any, used: set[int]) -> Any:
+        if isinstance(value, _PRIMITIVES):
+            return value
+        cls = type(value)
+        code = _CODES.get(cls)
+        if code is not None:
+            if cls in _MODEL_FIELDS:
+                return self._encode_model(value, code, used)
+            used.add(code)
+            return ormsgpack.Ext(code, ormsgpack.packb([self._encode(v, used) for v in value]))
+        if cls is list:
+            return [self._encode(v, used) for v in value]
+        if cls is dict and all(type(k) is str for k in value):
+            return {k: self._encode(v, used) for k, v in value.items()}
+        raise _Unsupported(cls)
+
+    def _encode_model(self, model: BaseModel, code: int, used: set[int]) -> ormsgpack.Ext:
+        key = id(model)
+        hit = self._memo.get(key)
+        if hit is not None and hit[0]() is model:
+            used.update(hit[2])
+            return hit[1]
+        inner: set[int] = {code}
+        fields = _MODEL_FIELDS[type(model)]
+        ext = ormsgpack.Ext(code, ormsgpack.packb([self._encode(getattr(model, f), inner) for f in fields]))
+        self._memo[key] = (weakref.ref(model, lambda _, key=key: self._memo.pop(key, None)), ext, frozenset(inner))
+        used.update(inner)
+        return ext
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        used: set[int] = set()
+        try:
+            value = self._encode(obj, used)
+        except _Unsupported:
+            return self.fallback.dumps_typed(obj)
+        data = ormsgpack.packb([[[code, _FIELDS[code]] for code in sorted(used)], ormsgpack.packb(value)])
+        if self.compress_threshold is not None and len(data) > self.compress_threshold:
+            return TYPE_TAG_COMPRESSED, zlib.compress(data, self.compress_level)
+        return TYPE_TAG, data
+
+    # -- decoding
+
+    @staticmethod
+    def _decoder(code: int, stored: tuple[str, ...]) -> Callable[[list], Any]:
+        """Build values -> object for one type, mapping the stored field names onto today's fields."""
+        cls = _MODELS.get(code) or _RECORDS.get(code)
+        if cls is None:
+            raise SchemaMismatch(f"Unknown checkpoint type code {code}")
+        current = _FIELDS[code]
+        build = (lambda kw: cls.model_construct(**kw)) if code in _MODELS else (lambda kw: cls(**kw))
+
+        if stored == current:
+            if code in _MODELS:
+                return lambda values: cls.model_construct(**dict(zip(current, values)))
+            return lambda values: cls(*values)
+
+        missing = _REQUIRED[code] - set(stored)
+        if missing:
+            raise SchemaMismatch(f"{cls.__name__}: stored blob lacks required field(s) {sorted(missing)}")
+        keep = frozenset(current)
+        # Dropped fields are ignored; added fields take their defaults
+        return lambda values: build({f: v for f, v in zip(stored, values) if f in keep})
+
+    def _unpack(self, payload: bytes, schema: dict[int, tuple[str, ...]]) -> Any:
+        decoders: dict[int, Callable[[list], Any]] = {}
+
+        errors: list[SchemaMismatch] = []
+
+        def ext_hook(code: int, data: bytes) -> Any:
+            try:
+                decode = decoders.get(code)
+                if decode is None:
+                    stored = schema.get(code)
+                    if stored is None:
+                        raise SchemaMismatch(f"Type code {code} missing from blob header")
+                    decode = decoders[code] = self._decoder(code, stored)
+                return decode(ormsgpack.unpackb(data, ext_hook=ext_hook))
+            except SchemaMismatch as exc:
+                errors.append(exc)
+                raise
+
+        try:
+            return ormsgpack.unpackb(payload, ext_hook=ext_hook)
+        except ValueError:
+            if errors:  # ormsgpack re-wraps hook errors as a bare ValueError
+                raise errors[0] from None
+            raise
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if type_ in (TYPE_TAG, TYPE_TAG_COMPRESSED):
+            raw = zlib.decompress(payload) if type_ == TYPE_TAG_COMPRESSED else payload
+            header, body = ormsgpack.unpackb(raw)
+            return self._unpack(body, {code: tuple(fields) for code, fields in header})
+        return self.fallback.loads_typed(data)
+
+    # Untyped API kept for checkpointers that still call it
+    def dumps(self, obj: Any) -> bytes:
+        return self.fallback.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return self.fallback.loads(data)
+
+
+@asynccontextmanager
+async def open_checkpointer() -> AsyncIterator[Any]:
+    """
+    Checkpointer for the app, always using TripStateSerializer.
+    CHECKPOINT_DB=<path> selects SQLite (requires langgraph-checkpoint-sqlite); default is in-memory.
+    """
+    serde = TripStateSerializer()
+    path = os.getenv("CHECKPOINT_DB")
+    if not path:
+        yield InMemorySaver(serde=serde)
+        return
+
+    import aiosqlite
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    async with aiosqlite.connect(path) as conn:
+        saver = AsyncSqliteSaver(conn, serde=serde)
+        await saver.setup()
+        yield saver
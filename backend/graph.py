@@ -1,19 +1,36 @@
 """
-LangGraph workflow: intent -> research -> approvals -> budget -> planner -> coordinator.
+LangGraph workflow: intent -> research (one branch per shortlisted destination) -> rank
+-> approvals -> budget -> planner -> coordinator.
 Uses interrupt() at three checkpoints for human-in-the-loop.
 """
 
 from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.graph import END, START, StateGraph
-from langgraph.types import interrupt
+from langgraph.types import Send, interrupt
 
 from agents.budget import optimize_budget
 from agents.coordinator import coordinate_bookings
 from agents.intent import parse_intent
-from agents.planner import plan_itinerary
+from agents.planner import plan_itinerary, warm_skeleton
+from agents.ranking import rank_destinations
 from agents.research import research
+from checkpointing import TripStateSerializer
+from offload import NodePool
+from profiling import profiled_node
 from state import GraphState
 
+# Nodes that may run in a NodePool, with the state keys each one reads (only these are shipped)
+OFFLOADABLE_NODES: dict[str, tuple[str, ...]] = {
+    "rank": ("parsed_intent", "destination_research"),
+    "budget": ("parsed_intent",),
+    "planner": ("parsed_intent",),
+    "coordinator": ("researched_data",),
+}
+# Lookups run in the serving process before a node is offloaded; their keys are shipped with its slice
+OFFLOAD_INPUTS = {
+    "planner": warm_skeleton,
+}
+
 
 def _serialize_for_interrupt(obj):
     """Convert state to JSON-serializable dict for interrupt payload."""
@@ -21,6 +38,8 @@ def _serialize_for_interrupt(obj):
         return None
     if hasattr(obj, "model_dump"):
         return obj.model_dump()
+    if hasattr(obj, "to_model"):  # compact state record: the API shape is its Pydantic model
+        return obj.to_model().model_dump()
     if isinstance(obj, list):
         return [_serialize_for_interrupt(x) for x in obj]
     if isinstance(obj, dict):
@@ -28,22 +47,42 @@ def _serialize_for_interrupt(obj):
     return obj
 
 
+def fan_out_research(state: GraphState) -> list[Send]:
+    """Map step: one parallel research branch per shortlisted destination."""
+    intent = state.get("parsed_intent")
+    shortlist = state.get("destination_shortlist") or [intent.destination if intent else None]
+    return [Send("research", {"parsed_intent": intent, "destination": d}) for d in shortlist]
+
+
 def approve_destinations(state: GraphState) -> GraphState:
-    """Pause for human approval of destination shortlist. Resume with any value to continue."""
+    """
+    Pause for human approval of the ranked destination shortlist.
+    Resume with a destination name (or {"destination": name}) to pick another candidate; any other value keeps the top one.
+    """
     shortlist = state.get("destination_shortlist") or []
     researched = state.get("researched_data")
     payload = {
         "checkpoint": "destination_shortlist",
         "message": "Approve destination shortlist?",
         "destination_shortlist": shortlist,
+        "ranked_destinations": _serialize_for_interrupt(state.get("ranked_destinations") or []),
         "researched_summary": {
             "flights_count": len(researched.flights) if researched else 0,
             "hotels_count": len(researched.hotels) if researched else 0,
             "activities_count": len(researched.activities) if researched else 0,
         } if researched else None,
     }
-    interrupt(payload)
-    return {"current_checkpoint": "destinations_approved"}
+    result = interrupt(payload)
+
+    # Approved: drop the per-destination research, keeping only the chosen one
+    update: GraphState = {"current_checkpoint": "destinations_approved", "destination_research": []}
+    choice = result.get("destination") if isinstance(result, dict) else result
+    by_name = {r.destination: r for r in state.get("destination_research") or []}
+    intent = state.get("parsed_intent")
+    if isinstance(choice, str) and choice in by_name and intent and choice != intent.destination:
+        update["researched_data"] = by_name[choice].researched_data
+        update["parsed_intent"] = intent.model_copy(update={"destination": choice})
+    return update
 
 
 def approve_budget(state: GraphState) -> GraphState:
@@ -74,29 +113,65 @@ def approve_itinerary(state: GraphState) -> GraphState:
     return {"current_checkpoint": "itinerary_approved"}
 
 
-def get_graph_with_checkpointer():
-    """Build and compile the travel planning graph with in-memory checkpointer."""
+def _build_graph(wrap=None) -> StateGraph:
+    """Define nodes and edges; wrap(name, fn) can decorate every node (e.g. for profiling)."""
     builder = StateGraph(GraphState)
 
-    builder.add_node("intent", parse_intent)
-    builder.add_node("research", research)
-    builder.add_node("approve_destinations", approve_destinations)
-    builder.add_node("budget", optimize_budget)
-    builder.add_node("approve_budget", approve_budget)
-    builder.add_node("planner", plan_itinerary)
-    builder.add_node("approve_itinerary", approve_itinerary)
-    builder.add_node("coordinator", coordinate_bookings)
+    def add(name, fn):
+        builder.add_node(name, wrap(name, fn) if wrap else fn)
+
+    add("intent", parse_intent)
+    add("research", research)
+    add("rank", rank_destinations)
+    add("approve_destinations", approve_destinations)
+    add("budget", optimize_budget)
+    add("approve_budget", approve_budget)
+    add("planner", plan_itinerary)
+    add("approve_itinerary", approve_itinerary)
+    add("coordinator", coordinate_bookings)
 
     builder.add_edge(START, "intent")
-    builder.add_edge("intent", "research")
-    builder.add_edge("research", "approve_destinations")
+    builder.add_conditional_edges("intent", fan_out_research, ["research"])
+    builder.add_edge("research", "rank")
+    builder.add_edge("rank", "approve_destinations")
     builder.add_edge("approve_destinations", "budget")
     builder.add_edge("budget", "approve_budget")
     builder.add_edge("approve_budget", "planner")
     builder.add_edge("planner", "approve_itinerary")
     builder.add_edge("approve_itinerary", "coordinator")
     builder.add_edge("coordinator", END)
+    return builder
 
-    checkpointer = InMemorySaver()
-    graph = builder.compile(checkpointer=checkpointer)
+
+def _offload_wrapper(pool: NodePool, offload):
+    """wrap(name, fn) that moves the named nodes into the process pool."""
+    unknown = set(offload) - set(OFFLOADABLE_NODES)
+    if unknown:
+        raise ValueError(f"Cannot offload nodes {sorted(unknown)}; offloadable: {sorted(OFFLOADABLE_NODES)}")
+
+    def wrap(name, fn):
+        if name not in offload:
+            return fn
+        return pool.node(name, fn, reads=OFFLOADABLE_NODES[name], inputs=OFFLOAD_INPUTS.get(name))
+
+    return wrap
+
+
+def get_graph_with_checkpointer(checkpointer=None, pool: NodePool = None, offload=()):
+    """
+    Build and compile the travel planning graph (in-memory checkpointer unless one is given).
+    Nodes named in offload (see OFFLOADABLE_NODES) run in pool's worker processes.
+    """
+    if checkpointer is None:
+        checkpointer = InMemorySaver(serde=TripStateSerializer())
+    wrap = _offload_wrapper(pool, offload) if pool and offload else None
+    graph = _build_graph(wrap=wrap).compile(checkpointer=checkpointer)
     return graph, checkpointer
+
+
+def get_profiled_graph(checkpointer):
+    """
+    Same graph with profiled nodes, sharing the checkpointer so threads can switch between them.
+    Nodes always run in-process here so the profile covers them.
+    """
+    return _build_graph(wrap=profiled_node).compile(checkpointer=checkpointer)
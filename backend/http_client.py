@@ -0,0 +1,176 @@
+"""
+Shared outbound HTTP client for provider calls (flights, hotels, weather, places).
+One pooled client is created in the app lifespan and injected into agents via the graph config.
+"""
+
+import asyncio
+import random
+from typing import Any, Optional
+
+import httpx
+
+from runtime import get_configurable
+
+# Statuses worth retrying: rate limits and transient upstream failures
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# Methods safe to send twice (RFC 9110); anything else is only retried when it never reached the server
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Failures that happen before the request is sent, so a retry cannot duplicate a side effect
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+# Statuses that say the server did not act on the request
+NOT_PROCESSED_STATUSES = frozenset({429, 503})
+
+
+class ProviderClient:
+    """
+    Thin wrapper around a pooled httpx.AsyncClient.
+    Adds retry with full-jitter exponential backoff and optional hedged requests for idempotent calls.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        *,
+        max_per_host: int = 10,
+        max_retries: int = 2,
+        backoff_base: float = 0.1,
+        backoff_max: float = 2.0,
+        hedge_after: Optional[float] = None,
+    ):
+        self.client = client
+        self.max_per_host = max_per_host
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_after = hedge_after
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+
+    def _backoff(self, attempt: int) -> float:
+        """Full jitter: uniform in [0, min(max, base * 2^attempt)]."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _slot(self, url: str) -> asyncio.Semaphore:
+        """Per-host concurrency limit so one slow provider cannot take the whole pool."""
+        host = httpx.URL(url).host or self.client.base_url.host
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.max_per_host)
+        return slot
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        async with self._slot(url):
+            return await self.client.request(method, url, **kwargs)
+
+    async def _send_hedged(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Fire a second copy if the first has not answered after hedge_after seconds; first success wins."""
+        first = asyncio.ensure_future(self._send(method, url, **kwargs))
+        done, _ = await asyncio.wait({first}, timeout=self.hedge_after)
+        if done:
+            return first.result()
+
+        tasks = [first, asyncio.ensure_future(self._send(method, url, **kwargs))]
+        pending = set(tasks)
+        winner: Optional[asyncio.Future] = None
+        error: Optional[BaseException] = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = winner or task
+                    else:
+                        error = task.exception()
+            if winner is None:
+                raise error  # both copies failed
+            return winner.result()
+        finally:
+            await self._discard(t for t in tasks if t is not winner)
+
+    @staticmethod
+    async def _discard(tasks) -> None:
+        """Cancel losing hedge copies and close any response they still produced."""
+        tasks = list(tasks)
+        for task in tasks:
+            task.cancel()
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, httpx.Response):
+                await result.aclose()
+
+    async def request(
+        self, method: str, url: str, *, hedge: bool = False, retry_unsafe: bool = False, **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Send a request with retries. Hedging is only applied when hedge=True (use for idempotent GETs).
+        Non-idempotent methods (POST, PATCH) are only retried on connect errors and 429/503, where the
+        server never acted on the request; retry_unsafe=True retries them like GETs (e.g. with an idempotency key).
+        Returns the last response for retryable statuses once retries are exhausted.
+        """
+        send = self._send_hedged if hedge and self.hedge_after else self._send
+        safe = retry_unsafe or method.upper() in IDEMPOTENT_METHODS
+        retry_errors = httpx.TransportError if safe else CONNECT_ERRORS
+        retry_statuses = RETRY_STATUSES if safe else NOT_PROCESSED_STATUSES
+        attempt = 0
+        while True:
+            try:
+                response = await send(method, url, **kwargs)
+            except retry_errors:
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                if response.status_code not in retry_statuses or attempt >= self.max_retries:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Idempotent GET; hedged when hedge_after is configured."""
+        return await self.request("GET", url, hedge=True, **kwargs)
+
+    async def post(self, url: str, *, retry_unsafe: bool = False, **kwargs: Any) -> httpx.Response:
+        """POST, never hedged; retried only when it cannot have reached the server unless retry_unsafe=True."""
+        return await self.request("POST", url, retry_unsafe=retry_unsafe, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close pooled connections (called from the app lifespan)."""
+        await self.client.aclose()
+
+
+def create_provider_client(
+    *,
+    base_url: str = "",
+    max_connections: int = 100,
+    max_keepalive_connections: int = 20,
+    max_per_host: int = 10,
+    keepalive_expiry: float = 30.0,
+    timeout: float = 10.0,
+    connect_timeout: float = 3.0,
+    http2: bool = True,
+    max_retries: int = 2,
+    hedge_after: Optional[float] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> ProviderClient:
+    """
+    Build the application-wide provider client.
+    Pass base_url pointing at a local mock server, or an httpx.MockTransport, to test provider code.
+    max_connections caps the whole pool and max_per_host caps in-flight requests per provider host;
+    keep-alive connections are reused across plans instead of re-handshaking TCP/TLS.
+    """
+    client = httpx.AsyncClient(
+        base_url=base_url,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(timeout, connect=connect_timeout),
+        transport=transport,
+        headers={"User-Agent": "travel-agent/0.1"},
+    )
+    return ProviderClient(client, max_per_host=max_per_host, max_retries=max_retries, hedge_after=hedge_after)
+
+
+def get_provider_client(config: Optional[dict]) -> Optional[ProviderClient]:
+    """Read the injected provider client from a LangGraph RunnableConfig (None if not configured)."""
+    return get_configurable(config, "http_client")
@@ -0,0 +1,77 @@
+"""
+Idempotent approvals: per-thread locking plus request de-duplication for graph resumes.
+A duplicate approve (double click, network retry) joins the in-flight run or gets the cached result.
+"""
+
+import asyncio
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+
+class ApprovalDeduplicator:
+    """
+    Runs at most one graph resume per (thread_id, idempotency key).
+    The resume runs as its own task, so cancelling the request that started it (client timeout or
+    disconnect) neither stops it nor fails the duplicates joined to it; completed results are kept
+    for ttl seconds. A per-thread lock serializes different keys on the same thread so resumes never interleave.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 10_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._done: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
+        self._locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+
+    def _cached(self, key: tuple[str, str]) -> tuple[bool, Any]:
+        entry = self._done.get(key)
+        if entry is None:
+            return False, None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._done[key]
+            return False, None
+        return True, result
+
+    def _store(self, key: tuple[str, str], result: Any) -> None:
+        self._done[key] = (time.monotonic() + self.ttl, result)
+        self._done.move_to_end(key)
+        while len(self._done) > self.max_entries:
+            self._done.popitem(last=False)
+
+    def _lock(self, thread_id: str) -> asyncio.Lock:
+        lock = self._locks.get(thread_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[thread_id] = lock
+        return lock
+
+    async def run(self, thread_id: str, idempotency_key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return fn()'s result, running fn at most once per key within the ttl window."""
+        key = (thread_id, idempotency_key)
+        hit, result = self._cached(key)
+        if hit:
+            return result
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.create_task(self._run_once(key, fn))
+            task.add_done_callback(_retrieve)
+        return await asyncio.shield(task)
+
+    async def _run_once(self, key: tuple[str, str], fn: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            async with self._lock(key[0]):
+                result = await fn()
+            # Failures are not cached: a retry after an error should run again
+            self._store(key, result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+
+def _retrieve(task: asyncio.Task) -> None:
+    """Mark a failed resume's exception retrieved when every caller has gone away."""
+    if not task.cancelled():
+        task.exception()
@@ -3,22 +3,62 @@ FastAPI application for the AI Travel Planning & Booking Agent.
 Exposes LangGraph workflow and approval/replan endpoints.
 """
 
-from contextlib import asynccontextmanager
+import asyncio
+import os
+from contextlib import asynccontextmanager, suppress
 from typing import Any
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
-from graph import get_graph_with_checkpointer
-from routes import plan_router
+from agents.intent_model import ChatModelIntentBackend, IntentModel
+from checkpointing import open_checkpointer
+from graph import get_graph_with_checkpointer, get_profiled_graph
+from http_client import create_provider_client
+from idempotency import ApprovalDeduplicator
+from offload import NodePool
+from profiling import ProfileStore
+from routes import admin_router, plan_router
+from warmup import TrafficGauge, WarmCache, WarmupJob
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Load graph and checkpointer on startup."""
-    app.state.graph, app.state.checkpointer = get_graph_with_checkpointer()
-    yield
-    # cleanup if needed
+    """Load graph and checkpointer on startup; own the pooled provider HTTP client and node process pool."""
+    node_pool = NodePool.from_env()
+    if node_pool:
+        await node_pool.start()
+    offload = [n.strip() for n in os.getenv("OFFLOAD_NODES", "planner").split(",") if n.strip()]
+    async with open_checkpointer() as checkpointer:
+        app.state.graph, app.state.checkpointer = get_graph_with_checkpointer(checkpointer, node_pool, offload)
+        app.state.profiled_graph = get_profiled_graph(app.state.checkpointer)
+        app.state.profiles = ProfileStore()
+        app.state.profiling_enabled = False
+        hedge_after = os.getenv("PROVIDER_HEDGE_AFTER")
+        app.state.http_client = create_provider_client(hedge_after=float(hedge_after) if hedge_after else None)
+        intent_backend = ChatModelIntentBackend.from_env()
+        app.state.intent_model = IntentModel(intent_backend) if intent_backend else None
+        app.state.approvals = ApprovalDeduplicator()
+        app.state.active_runs = {}  # thread_id -> asyncio.Task of a WS-started run
+        app.state.warm_cache = None
+        warm_task = None
+        if os.getenv("WARM_ENABLED", "1") != "0":
+            job = WarmupJob.from_env(WarmCache(), app.state.traffic, app.state.http_client)
+            job.cache.max_age = 2 * job.interval
+            app.state.warm_cache = job.cache
+            warm_task = asyncio.create_task(job.run_forever())
+        try:
+            yield
+        finally:
+            for run in list(app.state.active_runs.values()):
+                run.cancel()
+            if warm_task is not None:
+                warm_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await warm_task
+            await app.state.http_client.aclose()
+            if node_pool:
+                node_pool.shutdown()
 
 
 def create_app() -> FastAPI:
@@ -36,7 +76,19 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.state.traffic = TrafficGauge()
+
+    @app.middleware("http")
+    async def count_live_requests(request: Request, call_next):
+        """Track in-flight requests so background warming can stay out of the way."""
+        app.state.traffic.in_flight += 1
+        try:
+            return await call_next(request)
+        finally:
+            app.state.traffic.in_flight -= 1
+
     app.include_router(plan_router, prefix="/api/plan", tags=["plan"])
+    app.include_router(admin_router, prefix="/api/admin", tags=["admin"])
     return app
 
 
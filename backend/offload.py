@@ -0,0 +1,163 @@
+"""
+Process-pool offload for CPU-bound graph nodes.
+Marked nodes run in a managed pool of warm worker processes so their CPU work does not hold the GIL
+of the serving process. Only the state keys a node reads are shipped, encoded once as compact
+TripStateSerializer bytes (positional fields, no validation on decode); the node's update comes back the same way.
+"""
+
+import asyncio
+import inspect
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, Sequence
+
+from checkpointing import TripStateSerializer
+
+logger = logging.getLogger(__name__)
+
+# Worker-side serializer, created once per process by _init_worker
+_worker_serde: Optional[TripStateSerializer] = None
+
+
+def _init_worker(niceness: int) -> None:
+    """
+    Runs once in each worker: lower its CPU priority so request handling wins when cores are contended,
+    build the serializer and import the agents so the first node call is not cold.
+    """
+    global _worker_serde
+    if niceness and hasattr(os, "nice"):
+        os.nice(niceness)
+    import agents.budget  # noqa: F401
+    import agents.coordinator  # noqa: F401
+    import agents.planner  # noqa: F401
+    import agents.ranking  # noqa: F401
+
+    _worker_serde = TripStateSerializer(compress_threshold=None)
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+def _run_node(fn: Callable, payload: tuple[str, bytes]) -> tuple[str, bytes]:
+    """Worker entry point: decode the state slice, run the node, encode its update."""
+    state = _worker_serde.loads_typed(payload)
+    # Resources injected via config (HTTP client, caches) live in the serving process; NodePool.node's
+    # inputs hook ships what the node needs from them
+    update = fn(state, None) if "config" in inspect.signature(fn).parameters else fn(state)
+    return _worker_serde.dumps_typed(update)
+
+
+class NodeCrashed(RuntimeError):
+    """A worker process died while running a node, and again when the node was retried on its own."""
+
+
+class NodePool:
+    """
+    Managed ProcessPoolExecutor for graph nodes.
+    Workers are started with the spawn method (safe alongside the server's threads) and warmed up
+    front. If a worker dies, every task in flight on the pool fails with it: the broken pool is replaced,
+    and each of those tasks is retried once in a single-use worker of its own. Only a node whose input
+    crashes that worker too fails its run; the others complete and the pool keeps serving.
+    """
+
+    def __init__(self, size: int, niceness: int = 10):
+        if size < 1:
+            raise ValueError("NodePool size must be at least 1")
+        self.size = size
+        self.niceness = niceness
+        self.restarts = 0
+        self._serde = TripStateSerializer(compress_threshold=None)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def from_env(cls) -> Optional["NodePool"]:
+        """NODE_POOL_SIZE workers (0 or unset disables offloading), NODE_POOL_NICE worker priority."""
+        size = int(os.getenv("NODE_POOL_SIZE", "0"))
+        return cls(size, niceness=int(os.getenv("NODE_POOL_NICE", "10"))) if size > 0 else None
+
+    def _new_executor(self, size: Optional[int] = None) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=size or self.size,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.niceness,),
+        )
+
+    async def start(self) -> None:
+        """Create the pool and wait until every worker has started and run its initializer."""
+        self._executor = self._new_executor()
+        await self._warm(self._executor)
+
+    async def _warm(self, executor: ProcessPoolExecutor) -> None:
+        loop = asyncio.get_running_loop()
+        # The executor spawns a new worker per pending task while below max_workers
+        await asyncio.gather(*(loop.run_in_executor(executor, _ready) for _ in range(self.size)))
+
+    async def _replace(self, broken: ProcessPoolExecutor) -> None:
+        """Swap in a fresh pool, unless a concurrent caller already replaced this one."""
+        if self._executor is not broken:
+            return
+        self.restarts += 1
+        logger.warning("Node worker died; restarting process pool (restart %d)", self.restarts)
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._new_executor()
+        await self._warm(self._executor)
+
+    async def run(self, fn: Callable, state: dict[str, Any]) -> dict[str, Any]:
+        """Run fn(state) in a worker and return its state update."""
+        if self._executor is None:
+            raise RuntimeError("NodePool.start() has not been awaited")
+        payload = self._serde.dumps_typed(state)
+        executor = self._executor
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(executor, _run_node, fn, payload)
+        except BrokenProcessPool:
+            # The crash may have been another task's; retrying alone tells whether this input is the cause
+            await self._replace(executor)
+            result = await self._run_isolated(fn, payload)
+        return self._serde.loads_typed(result)
+
+    async def _run_isolated(self, fn: Callable, payload: tuple[str, bytes]) -> tuple[str, bytes]:
+        """Run one node in a single-use worker, so a crash there can only be caused by this node's input."""
+        executor = self._new_executor(1)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, _run_node, fn, payload)
+        except BrokenProcessPool as exc:
+            raise NodeCrashed(f"Worker died running {fn.__name__}") from exc
+        finally:
+            executor.shutdown(wait=False)
+
+    def node(
+        self,
+        name: str,
+        fn: Callable,
+        reads: Optional[Sequence[str]] = None,
+        inputs: Optional[Callable[[dict, Optional[dict]], dict[str, Any]]] = None,
+    ) -> Callable:
+        """
+        Graph node that runs fn in the pool, shipping only the state keys in reads (whole state if None).
+        fn must be a module-level sync function; it gets config=None in the worker, so anything it needs
+        from config is looked up here by inputs(state, config) and shipped as extra state keys.
+        """
+        if inspect.iscoroutinefunction(fn):
+            raise ValueError(f"Node {name!r} is async; only sync CPU-bound nodes can be offloaded")
+
+        async def offloaded(state, config=None):
+            keys = reads if reads is not None else state.keys()
+            payload = {k: state.get(k) for k in keys}
+            if inputs is not None:
+                payload.update(inputs(state, config))
+            return await self.run(fn, payload)
+
+        offloaded.__name__ = fn.__name__
+        offloaded.__doc__ = fn.__doc__
+        return offloaded
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
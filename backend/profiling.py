@@ -0,0 +1,226 @@
+"""
+On-demand profiling of single plan runs.
+Profiled runs use a second compiled graph whose nodes are wrapped with cProfile and timers,
+so the regular graph carries no profiling code at all when the mode is off.
+Only one node is profiled at a time: on Python 3.12+ cProfile uses process-wide sys.monitoring and a
+second active profiler raises. Nodes that overlap a profiled one record wall time only, and profiler
+failures never reach the graph run.
+"""
+
+import cProfile
+import inspect
+import io
+import marshal
+import pstats
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from langchain_core.runnables import RunnableConfig
+
+from runtime import get_configurable
+
+AGENTS_DIR = str(Path(__file__).resolve().parent / "agents")
+
+# Held by the node being profiled; other profiled runs skip cProfile instead of waiting
+_profiler_slot = threading.Lock()
+
+
+class NodeProfile:
+    """Wall time and cProfile stats for one node execution (stats is None when profiling was skipped)."""
+
+    def __init__(self, node: str, wall_ms: float, stats: Optional[pstats.Stats]):
+        self.node = node
+        self.wall_ms = wall_ms
+        self.stats = stats
+
+    def agent_functions(self, limit: int = 10) -> list[dict[str, Any]]:
+        """Functions defined under backend/agents/, by cumulative time."""
+        if self.stats is None:
+            return []
+        rows = []
+        for (filename, line, func), (_, calls, tottime, cumtime, _) in self.stats.stats.items():
+            if filename.startswith(AGENTS_DIR):
+                rows.append({
+                    "function": f"{Path(filename).name}:{line}({func})",
+                    "calls": calls,
+                    "tottime_ms": round(tottime * 1000, 3),
+                    "cumtime_ms": round(cumtime * 1000, 3),
+                })
+        rows.sort(key=lambda r: r["cumtime_ms"], reverse=True)
+        return rows[:limit]
+
+
+class RunProfile:
+    """Profile of one create_plan or approve run for a thread."""
+
+    def __init__(self, thread_id: str, kind: str):
+        self.thread_id = thread_id
+        self.kind = kind
+        self.started_at = time.time()
+        self.wall_ms: Optional[float] = None
+        self.nodes: list[NodeProfile] = []
+        self._t0 = time.perf_counter()
+
+    def finish(self) -> None:
+        self.wall_ms = (time.perf_counter() - self._t0) * 1000
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "started_at": self.started_at,
+            "wall_ms": round(self.wall_ms or 0.0, 3),
+            "nodes": [
+                {
+                    "node": n.node,
+                    "wall_ms": round(n.wall_ms, 3),
+                    "profiled": n.stats is not None,
+                    "agent_functions": n.agent_functions(),
+                }
+                for n in self.nodes
+            ],
+        }
+
+    def stats(self) -> Optional[pstats.Stats]:
+        """All node stats merged (None if no node was profiled)."""
+        stats = [n.stats for n in self.nodes if n.stats is not None]
+        if not stats:
+            return None
+        merged = pstats.Stats(stream=io.StringIO())
+        merged.add(*stats)
+        return merged
+
+
+class ProfileStore:
+    """Bounded store of run profiles keyed by thread_id (oldest threads evicted first)."""
+
+    def __init__(self, max_threads: int = 200):
+        self.max_threads = max_threads
+        self._runs: OrderedDict[str, list[RunProfile]] = OrderedDict()
+
+    def add(self, profile: RunProfile) -> None:
+        self._runs.setdefault(profile.thread_id, []).append(profile)
+        self._runs.move_to_end(profile.thread_id)
+        while len(self._runs) > self.max_threads:
+            self._runs.popitem(last=False)
+
+    def get(self, thread_id: str) -> list[RunProfile]:
+        return self._runs.get(thread_id, [])
+
+    def dump_pstats(self, thread_id: str) -> Optional[bytes]:
+        """All runs for a thread in the binary format pstats/snakeviz load (same as Stats.dump_stats)."""
+        runs = [stats for stats in (run.stats() for run in self.get(thread_id)) if stats is not None]
+        if not runs:
+            return None
+        merged = pstats.Stats(stream=io.StringIO())
+        merged.add(*runs)
+        return marshal.dumps(merged.stats)
+
+
+def _claim_profiler() -> Optional[cProfile.Profile]:
+    """A profiler holding the slot, or None if another node is being profiled."""
+    if not _profiler_slot.acquire(blocking=False):
+        return None
+    try:
+        return cProfile.Profile()
+    except Exception:
+        _profiler_slot.release()
+        return None
+
+
+def _enable(profiler: cProfile.Profile) -> bool:
+    """Start collecting; False if another profiling tool (debugger, coverage) owns the hooks."""
+    try:
+        profiler.enable()
+        return True
+    except (ValueError, RuntimeError):
+        return False
+
+
+def _disable(profiler: cProfile.Profile) -> None:
+    try:
+        profiler.disable()
+    except (ValueError, RuntimeError):
+        pass
+
+
+class _ProfiledSteps:
+    """Drive a coroutine, enabling the profiler only while it executes (not while it awaits)."""
+
+    def __init__(self, coro, profiler: cProfile.Profile):
+        self.coro = coro
+        self.profiler = profiler
+        self.collected = False
+
+    def __await__(self):
+        value, error = None, None
+        while True:
+            enabled = _enable(self.profiler)
+            self.collected = self.collected or enabled
+            try:
+                yielded = self.coro.throw(error) if error is not None else self.coro.send(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                if enabled:
+                    _disable(self.profiler)
+            try:
+                value, error = (yield yielded), None
+            except BaseException as exc:  # delivered into the coroutine on the next step
+                value, error = None, exc
+
+
+def profiled_node(name: str, fn: Callable) -> Callable:
+    """
+    Wrap a graph node so each execution records wall time and cProfile stats into the run's RunProfile.
+    Sync nodes are profiled in the worker thread they run on; async nodes only while they hold the loop.
+    """
+    takes_config = "config" in inspect.signature(fn).parameters
+
+    def _record(profiler: Optional[cProfile.Profile], collected: bool, started: float, profile: RunProfile) -> None:
+        wall_ms = (time.perf_counter() - started) * 1000
+        stats = None
+        if profiler is not None:
+            try:
+                stats = pstats.Stats(profiler, stream=io.StringIO()) if collected else None
+            except Exception:
+                stats = None
+            finally:
+                _profiler_slot.release()
+        profile.nodes.append(NodeProfile(name, wall_ms, stats))
+
+    if inspect.iscoroutinefunction(fn):
+        async def node(state, config: RunnableConfig):
+            args = (state, config) if takes_config else (state,)
+            profile: Optional[RunProfile] = get_configurable(config, "profile")
+            if profile is None:
+                return await fn(*args)
+            profiler = _claim_profiler()
+            started = time.perf_counter()
+            coro = fn(*args)
+            steps = _ProfiledSteps(coro, profiler) if profiler is not None else None
+            try:
+                return await (steps or coro)
+            finally:
+                _record(profiler, steps is not None and steps.collected, started, profile)
+    else:
+        def node(state, config: RunnableConfig):
+            args = (state, config) if takes_config else (state,)
+            profile: Optional[RunProfile] = get_configurable(config, "profile")
+            if profile is None:
+                return fn(*args)
+            profiler = _claim_profiler()
+            started = time.perf_counter()
+            enabled = profiler is not None and _enable(profiler)
+            try:
+                return fn(*args)
+            finally:
+                if enabled:
+                    _disable(profiler)
+                _record(profiler, enabled, started, profile)
+
+    # No functools.wraps: LangGraph inspects the signature and must see the config parameter
+    node.__name__ = node.__qualname__ = getattr(fn, "__name__", name)
+    return node
@@ -0,0 +1,54 @@
+"""
+External data providers used by the Research Agent.
+Each provider takes the shared ProviderClient; callers fall back to demo data when a provider fails.
+"""
+
+import os
+from typing import Optional
+
+import httpx
+
+from http_client import ProviderClient
+from state import WeatherInfo
+
+OPEN_METEO_GEOCODE_URL = "https://geocoding-api.open-meteo.com/v1/search"
+OPEN_METEO_FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+
+
+def live_weather_enabled() -> bool:
+    """Live weather is opt-in so the demo keeps working offline (WEATHER_PROVIDER=open-meteo)."""
+    return os.getenv("WEATHER_PROVIDER", "demo").lower() == "open-meteo"
+
+
+async def fetch_weather(client: ProviderClient, location: str, days: int = 4) -> Optional[list[WeatherInfo]]:
+    """Fetch a daily forecast from Open-Meteo (no API key). Returns None on any provider failure."""
+    try:
+        geo = await client.get(OPEN_METEO_GEOCODE_URL, params={"name": location, "count": 1})
+        geo.raise_for_status()
+        results = geo.json().get("results") or []
+        if not results:
+            return None
+        place = results[0]
+        forecast = await client.get(
+            OPEN_METEO_FORECAST_URL,
+            params={
+                "latitude": place["latitude"],
+                "longitude": place["longitude"],
+                "daily": "temperature_2m_min,temperature_2m_max",
+                "forecast_days": max(1, min(days, 16)),
+                "timezone": "auto",
+            },
+        )
+        forecast.raise_for_status()
+        daily = forecast.json().get("daily") or {}
+    except (httpx.HTTPError, ValueError, KeyError):
+        return None
+
+    return [
+        WeatherInfo(location=location, date=date, temp_min=t_min, temp_max=t_max, summary="Forecast")
+        for date, t_min, t_max in zip(
+            daily.get("time", []),
+            daily.get("temperature_2m_min", []),
+            daily.get("temperature_2m_max", []),
+        )
+    ] or None
@@ -1,14 +1,27 @@
 """
-FastAPI routes for plan creation, approval (resume), and state retrieval.
+FastAPI routes for plan creation, approval (resume), and state retrieval,
+a WebSocket planning session, and admin routes for on-demand profiling.
 """
 
+import asyncio
+import hmac
+import json
+import logging
+import os
+import uuid
 from typing import Any, Optional
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Header, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.requests import HTTPConnection
 from langgraph.types import Command
 from pydantic import BaseModel, Field
 
+from profiling import RunProfile
+
+logger = logging.getLogger(__name__)
+
 plan_router = APIRouter()
+admin_router = APIRouter()
 
 
 class CreatePlanRequest(BaseModel):
@@ -18,14 +31,29 @@ class CreatePlanRequest(BaseModel):
     thread_id: Optional[str] = Field(None, description="Resume existing plan; omit for new plan")
 
 
+class ProfilingToggle(BaseModel):
+    """Request body for switching profiling of every run on or off."""
+
+    enabled: bool
+
+
 class ApproveRequest(BaseModel):
     """Request body for resuming after an approval checkpoint."""
 
     resume: Any = Field(..., description="Approval payload (e.g. true or modified budget dict)")
+    checkpoint: Optional[str] = Field(
+        None,
+        min_length=1,
+        description="Checkpoint being approved, from the interrupt (e.g. budget_allocation); "
+        "omit to approve whatever the thread is parked at",
+    )
+    idempotency_key: Optional[str] = Field(
+        None, description="Same key = same approval; duplicates reuse the first result"
+    )
 
 
 def _state_to_dict(state: dict) -> dict:
-    """Convert graph state to JSON-serializable dict (Pydantic models to dict)."""
+    """Convert graph state to JSON-serializable dict (Pydantic models and records to dict)."""
     out = {}
     for k, v in state.items():
         if k.startswith("__"):
@@ -34,7 +62,9 @@ def _state_to_dict(state: dict) -> dict:
             out[k] = v.model_dump()
         elif isinstance(v, list):
             out[k] = [
-                x.model_dump() if hasattr(x, "model_dump") else x
+                x.model_dump() if hasattr(x, "model_dump")
+                else x.to_model().model_dump() if hasattr(x, "to_model")  # compact state records
+                else x
                 for x in v
             ]
         else:
@@ -42,15 +72,65 @@ def _state_to_dict(state: dict) -> dict:
     return out
 
 
+def _run_config(request: HTTPConnection, thread_id: str) -> dict:
+    """Graph config for a run: thread_id plus shared resources injected into agents."""
+    return {
+        "configurable": {
+            "thread_id": thread_id,
+            "http_client": request.app.state.http_client,
+            "intent_model": request.app.state.intent_model,
+            "warm_cache": request.app.state.warm_cache,
+        }
+    }
+
+
+def _is_admin(request: Request) -> bool:
+    """X-Admin-Token must match ADMIN_TOKEN; admin features are off when ADMIN_TOKEN is unset."""
+    token = os.getenv("ADMIN_TOKEN")
+    # Compare bytes: compare_digest raises TypeError on str with non-ASCII characters
+    sent = request.headers.get("x-admin-token", "").encode()
+    return bool(token) and hmac.compare_digest(sent, token.encode())
+
+
+def _profile_requested(request: Request) -> bool:
+    """Profile this run if the admin toggle is on, or an admin sent X-Profile: 1."""
+    if request.app.state.profiling_enabled:
+        return True
+    return request.headers.get("x-profile") == "1" and _is_admin(request)
+
+
+def _start_profile(app, config: dict, kind: str, requested: bool) -> tuple[Any, dict, Optional[RunProfile]]:
+    """(graph, config, profile) for a run: the profiled graph with a fresh RunProfile when requested."""
+    if not requested:
+        return app.state.graph, config, None
+    profile = RunProfile(config["configurable"]["thread_id"], kind)
+    config = {**config, "configurable": {**config["configurable"], "profile": profile}}
+    return app.state.profiled_graph, config, profile
+
+
+def _finish_profile(app, profile: Optional[RunProfile]) -> None:
+    if profile is not None:
+        profile.finish()
+        app.state.profiles.add(profile)
+
+
+async def _invoke(request: Request, graph_input: Any, config: dict, kind: str) -> dict:
+    """Run the graph; profiled runs go through the profiled graph and are stored by thread_id."""
+    graph, config, profile = _start_profile(request.app, config, kind, _profile_requested(request))
+    try:
+        return await graph.ainvoke(graph_input, config=config)
+    finally:
+        _finish_profile(request.app, profile)
+
+
 @plan_router.post("", status_code=200)
 async def create_plan(request: Request, body: CreatePlanRequest):
     """
     Start a new plan or continue from a checkpoint.
     If thread_id is provided and graph is at interrupt, use ApproveRequest to resume instead.
     """
-    graph = request.app.state.graph
     thread_id = body.thread_id or f"plan-{id(body)}"
-    config = {"configurable": {"thread_id": thread_id}}
+    config = _run_config(request, thread_id)
 
     if body.thread_id:
         # Resuming: need to call with Command(resume=...) - use approve endpoint
@@ -60,7 +140,7 @@ async def create_plan(request: Request, body: CreatePlanRequest):
         }
 
     inputs = {"user_input": body.user_input}
-    result = graph.invoke(inputs, config=config)
+    result = await _invoke(request, inputs, config, "create_plan")
 
     interrupted = result.pop("__interrupt__", None)
     if interrupted:
@@ -78,28 +158,97 @@ async def create_plan(request: Request, body: CreatePlanRequest):
     }
 
 
+class StaleCheckpoint(Exception):
+    """The approval names a checkpoint the thread is no longer waiting on (already approved or not reached)."""
+
+    def __init__(self, checkpoint: Optional[str], awaiting: Optional[str]):
+        super().__init__(checkpoint)
+        self.checkpoint = checkpoint
+        self.awaiting = awaiting
+
+
+def _interrupt_values(snapshot) -> list:
+    return [getattr(i, "value", i) for task in (snapshot.tasks or ()) for i in task.interrupts]
+
+
+async def _thread_position(graph, thread_id: str) -> tuple[Optional[str], Optional[str]]:
+    """
+    (name of the checkpoint the thread is parked at, or None when it is not awaiting approval;
+    id of the thread's latest saved checkpoint).
+    """
+    snapshot = await graph.aget_state({"configurable": {"thread_id": thread_id}})
+    if not snapshot:
+        return None, None
+    interrupts = _interrupt_values(snapshot)
+    first = interrupts[0] if interrupts else None
+    name = first.get("checkpoint") if isinstance(first, dict) else None
+    return name, (snapshot.config or {}).get("configurable", {}).get("checkpoint_id")
+
+
+async def _ensure_pending(
+    graph, thread_id: str, checkpoint: Optional[str], checkpoint_id: Optional[str] = None
+) -> None:
+    """
+    Call under the thread's approval lock, so a resume that just finished is visible.
+    Without a checkpoint name, approve whatever is pending as long as the thread has not moved
+    past checkpoint_id (its position when the idempotency key was chosen).
+    """
+    awaiting, current_id = await _thread_position(graph, thread_id)
+    if checkpoint is None:
+        if awaiting is None or current_id != checkpoint_id:
+            raise StaleCheckpoint(checkpoint, awaiting)
+    elif awaiting != checkpoint:
+        raise StaleCheckpoint(checkpoint, awaiting)
+
+
 @plan_router.post("/{thread_id}/approve", status_code=200)
-async def approve(request: Request, thread_id: str, body: ApproveRequest):
-    """Resume graph after human approval at a checkpoint."""
+async def approve(
+    request: Request,
+    thread_id: str,
+    body: ApproveRequest,
+    idempotency_key: Optional[str] = Header(None),
+):
+    """
+    Resume graph after human approval at the named checkpoint.
+    Idempotent per key (body, Idempotency-Key header, or thread_id:checkpoint by default): duplicates
+    cost one graph run, not N. An approval for a checkpoint the thread is no longer parked at
+    (a retry after the cached result expired, or a different key) gets 409 and never advances the plan.
+    Bodies without a checkpoint approve whatever is pending, keyed by the thread's current saved
+    checkpoint: concurrent duplicates share one run, but a retry after it finished approves the next step.
+    """
     graph = request.app.state.graph
-    config = {"configurable": {"thread_id": thread_id}}
+    config = _run_config(request, thread_id)
+    checkpoint_id = None
+    if body.checkpoint is None:
+        _, checkpoint_id = await _thread_position(graph, thread_id)
+    key = body.idempotency_key or idempotency_key or f"{thread_id}:{body.checkpoint or checkpoint_id}"
 
-    result = graph.invoke(Command(resume=body.resume), config=config)
+    async def resume() -> dict:
+        await _ensure_pending(graph, thread_id, body.checkpoint, checkpoint_id)
+        result = await _invoke(request, Command(resume=body.resume), config, "approve")
+
+        interrupted = result.pop("__interrupt__", None)
+        if interrupted:
+            return {
+                "thread_id": thread_id,
+                "status": "awaiting_approval",
+                "interrupt": [getattr(i, "value", i) for i in interrupted],
+                "state": _state_to_dict(result),
+            }
 
-    interrupted = result.pop("__interrupt__", None)
-    if interrupted:
         return {
             "thread_id": thread_id,
-            "status": "awaiting_approval",
-            "interrupt": [getattr(i, "value", i) for i in interrupted],
+            "status": "complete",
             "state": _state_to_dict(result),
         }
 
-    return {
-        "thread_id": thread_id,
-        "status": "complete",
-        "state": _state_to_dict(result),
-    }
+    try:
+        return await request.app.state.approvals.run(thread_id, key, resume)
+    except StaleCheckpoint as exc:
+        raise HTTPException(
+            status_code=409,
+            detail={"error": "stale_checkpoint", "checkpoint": exc.checkpoint, "awaiting": exc.awaiting},
+        )
 
 
 @plan_router.get("/{thread_id}", status_code=200)
@@ -108,7 +257,7 @@ async def get_plan_state(request: Request, thread_id: str):
     graph = request.app.state.graph
     config = {"configurable": {"thread_id": thread_id}}
 
-    state = graph.get_state(config)
+    state = await graph.aget_state(config)
     if not state or not state.values:
         return {"thread_id": thread_id, "state": None, "status": "not_found"}
 
@@ -119,3 +268,250 @@ async def get_plan_state(request: Request, thread_id: str):
         "state": _state_to_dict(dict(values)),
         "status": "awaiting_approval" if interrupted else "complete",
     }
+
+
+def _send(websocket: WebSocket, message: dict):
+    """Compact JSON frame (no whitespace) to keep per-message cost low."""
+    return websocket.send_text(json.dumps(message, separators=(",", ":"), default=str))
+
+
+async def _drain_run(app, graph_input: Any, config: dict, kind: str, frames: asyncio.Queue) -> dict:
+    """
+    Run the graph to its next interrupt or the end, queueing a frame per step and None when done.
+    Never touches the socket, so a client that disconnects mid-run cannot stop it.
+    WS sessions carry no admin headers, so only the admin profiling toggle applies to them.
+    """
+    thread_id = config["configurable"]["thread_id"]
+    graph, config, profile = _start_profile(app, config, kind, app.state.profiling_enabled)
+    interrupts: list = []
+    app.state.traffic.in_flight += 1  # live traffic for background warming, like an HTTP request
+    try:
+        async for chunk in graph.astream(graph_input, config=config, stream_mode="updates"):
+            for node, update in chunk.items():
+                if node == "__interrupt__":
+                    interrupts.extend(getattr(i, "value", i) for i in update)
+                else:
+                    frames.put_nowait({"type": "node", "node": node, "diff": _state_to_dict(update or {})})
+        if interrupts:
+            frames.put_nowait({"type": "interrupt", "thread_id": thread_id, "interrupt": interrupts})
+            return {"thread_id": thread_id, "status": "awaiting_approval", "interrupt": interrupts}
+        frames.put_nowait({"type": "complete", "thread_id": thread_id})
+        return {"thread_id": thread_id, "status": "complete"}
+    finally:
+        app.state.traffic.in_flight -= 1
+        _finish_profile(app, profile)
+        frames.put_nowait(None)
+
+
+def _track_run(app, thread_id: str, run: asyncio.Task) -> None:
+    """Register a background run so "attach" can wait for it; unregistered when it finishes."""
+    active = app.state.active_runs
+    active[thread_id] = run
+
+    def _done(_):
+        if active.get(thread_id) is run:
+            del active[thread_id]
+
+    run.add_done_callback(_done)
+
+
+async def _stream_run(websocket: WebSocket, graph_input: Any, config: dict, kind: str) -> dict:
+    """
+    Stream one run over the socket: a "node" message with the node's state diff after each step,
+    then "interrupt" or "complete". Returns the same payload shape as the HTTP endpoints.
+    The run is its own task: if the socket goes away it keeps going, and "attach" picks up the outcome.
+    """
+    frames: asyncio.Queue = asyncio.Queue()
+    run = asyncio.create_task(_drain_run(websocket.app, graph_input, config, kind, frames))
+    _track_run(websocket.app, config["configurable"]["thread_id"], run)
+
+    connected = True
+    while (frame := await frames.get()) is not None:
+        if connected:
+            try:
+                await _send(websocket, frame)
+            except Exception:  # client went away; keep draining, the run is unaffected
+                connected = False
+    return await asyncio.shield(run)
+
+
+def _outcome_frame(result: dict) -> dict:
+    if result.get("interrupt"):
+        return {"type": "interrupt", "thread_id": result.get("thread_id"), "interrupt": result["interrupt"]}
+    return {"type": "complete", "thread_id": result.get("thread_id")}
+
+
+def _snapshot_status(snapshot, interrupts: list, running: bool) -> str:
+    """
+    awaiting_approval: parked at an interrupt; running: a run is in progress in this process;
+    stalled: nodes still to run but nothing running them (e.g. the server restarted mid-run); else complete.
+    """
+    if interrupts:
+        return "awaiting_approval"
+    if running:
+        return "running"
+    return "stalled" if snapshot.next else "complete"
+
+
+async def _recover(websocket: WebSocket, thread_id: str) -> dict:
+    """Continue a stalled run from its last checkpoint, at most once even if several sessions attach."""
+    graph = websocket.app.state.graph
+    config = _run_config(websocket, thread_id)
+    snapshot = await graph.aget_state(config)
+    streamed = []
+
+    async def run() -> dict:
+        current = await graph.aget_state(config)  # under the thread lock: maybe already recovered
+        interrupts = _interrupt_values(current)
+        if interrupts or not current.next:
+            return {"thread_id": thread_id, "interrupt": interrupts}
+        streamed.append(True)
+        return await _stream_run(websocket, None, config, "recover")
+
+    checkpoint_id = snapshot.config["configurable"].get("checkpoint_id")
+    result = await websocket.app.state.approvals.run(thread_id, f"{thread_id}:recover:{checkpoint_id}", run)
+    if not streamed:
+        await _send(websocket, _outcome_frame({**result, "thread_id": thread_id}))
+    return result
+
+
+@plan_router.websocket("/ws")
+async def plan_session(websocket: WebSocket):
+    """
+    One persistent connection per planning session.
+    Client messages:
+      {"type": "start", "user_input": "..."}             new plan
+      {"type": "attach", "thread_id": "..."}             reconnect to an existing plan
+      {"type": "approve", "resume": ..., "checkpoint": "budget_allocation"}
+    Server messages: "session", "node" (state diff), "interrupt", "complete", "error".
+    While parked at an approval the session holds only the thread_id and awaited checkpoint name;
+    all plan state lives in the checkpointer. Runs continue if the socket drops; "attach" reports
+    the status, waits for a run still in progress, or continues a stalled one.
+    """
+    await websocket.accept()
+    thread_id: Optional[str] = None
+    awaiting: Optional[str] = None  # checkpoint name of the pending interrupt
+
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except (ValueError, KeyError):  # not JSON, or a binary frame
+                await _send(websocket, {"type": "error", "detail": "invalid_json"})
+                continue
+            kind = message.get("type") if isinstance(message, dict) else None
+
+            try:
+                if kind == "start" and message.get("user_input"):
+                    thread_id = f"plan-{uuid.uuid4().hex}"
+                    await _send(websocket, {"type": "session", "thread_id": thread_id})
+                    config = _run_config(websocket, thread_id)
+                    result = await _stream_run(websocket, {"user_input": message["user_input"]}, config, "create_plan")
+
+                elif kind == "attach" and message.get("thread_id"):
+                    thread_id = message["thread_id"]
+                    snapshot = await websocket.app.state.graph.aget_state({"configurable": {"thread_id": thread_id}})
+                    if not snapshot or not snapshot.values:
+                        await _send(websocket, {"type": "error", "detail": "not_found", "thread_id": thread_id})
+                        thread_id = awaiting = None
+                        continue
+                    active = websocket.app.state.active_runs.get(thread_id)
+                    interrupts = _interrupt_values(snapshot)
+                    status = _snapshot_status(snapshot, interrupts, running=active is not None)
+                    await _send(websocket, {
+                        "type": "session",
+                        "thread_id": thread_id,
+                        "status": status,
+                        "state": _state_to_dict(dict(snapshot.values)),
+                        "interrupt": interrupts,
+                    })
+                    if active is not None:
+                        # A run from an earlier connection is still going: report its outcome when it lands
+                        result = await asyncio.shield(active)
+                        await _send(websocket, _outcome_frame(result))
+                    elif status == "stalled":
+                        result = await _recover(websocket, thread_id)
+                    else:
+                        result = {"status": status, "interrupt": interrupts}
+
+                elif kind == "approve":
+                    if not (thread_id and awaiting):
+                        await _send(websocket, {"type": "error", "detail": "not_awaiting_approval"})
+                        continue
+                    checkpoint = message.get("checkpoint") or awaiting
+                    if checkpoint != awaiting:
+                        # Stale or duplicate approval for a checkpoint that already passed
+                        await _send(websocket, {"type": "error", "detail": "stale_checkpoint", "awaiting": awaiting})
+                        continue
+                    config = _run_config(websocket, thread_id)
+                    streamed = []
+
+                    async def run(resume=message.get("resume", True)):
+                        await _ensure_pending(websocket.app.state.graph, thread_id, checkpoint)
+                        streamed.append(True)
+                        return await _stream_run(websocket, Command(resume=resume), config, "approve")
+
+                    try:
+                        result = await websocket.app.state.approvals.run(
+                            thread_id, f"{thread_id}:{checkpoint}", run  # same key the web client uses over HTTP
+                        )
+                    except StaleCheckpoint as exc:
+                        # Another connection or an HTTP approve moved the plan on and its result has expired
+                        await _send(
+                            websocket, {"type": "error", "detail": "stale_checkpoint", "awaiting": exc.awaiting}
+                        )
+                        awaiting = exc.awaiting
+                        continue
+                    if not streamed:
+                        # Another connection or an HTTP approve already ran this checkpoint: replay its outcome
+                        await _send(websocket, {**_outcome_frame(result), "state": result.get("state")})
+
+                else:
+                    await _send(websocket, {"type": "error", "detail": f"unexpected message: {kind}"})
+                    continue
+
+            except WebSocketDisconnect:
+                raise
+            except Exception:
+                # The run failed (graph or checkpointer error): report it and keep the session usable;
+                # the thread stays at its last checkpoint, and "attach" can continue it
+                logger.exception("WS %s failed for thread %s", kind, thread_id)
+                await _send(websocket, {"type": "error", "detail": "run_failed", "thread_id": thread_id})
+                awaiting = None
+                continue
+
+            interrupts = result.get("interrupt") or []
+            awaiting = interrupts[0].get("checkpoint") if interrupts and isinstance(interrupts[0], dict) else None
+    except WebSocketDisconnect:
+        return
+
+
+@admin_router.put("/profiling", status_code=200)
+async def set_profiling(request: Request, body: ProfilingToggle):
+    """Profile every create_plan/approve run while enabled (admin only)."""
+    if not _is_admin(request):
+        raise HTTPException(status_code=403, detail="Admin token required")
+    request.app.state.profiling_enabled = body.enabled
+    return {"profiling_enabled": body.enabled}
+
+
+@admin_router.get("/profiles/{thread_id}", status_code=200)
+async def get_profile(request: Request, thread_id: str, format: str = "json"):
+    """
+    Download profiles for a thread: per-node and per-agent-function timings as JSON,
+    or format=pstats for a binary file loadable with pstats / snakeviz.
+    """
+    if not _is_admin(request):
+        raise HTTPException(status_code=403, detail="Admin token required")
+    store = request.app.state.profiles
+    if format == "pstats":
+        data = store.dump_pstats(thread_id)
+        if data is None:
+            raise HTTPException(status_code=404, detail="No profile for thread")
+        return Response(
+            content=data,
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{thread_id}.prof"'},
+        )
+    runs = store.get(thread_id)
+    return {"thread_id": thread_id, "runs": [run.summary() for run in runs], "status": "ok" if runs else "not_found"}
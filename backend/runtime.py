@@ -0,0 +1,15 @@
+"""
+Per-run resources injected into graph nodes through config["configurable"]
+(see routes._run_config): provider client, intent model, warm cache, run profile.
+"""
+
+from typing import Any, Optional
+
+from langchain_core.runnables import RunnableConfig
+
+
+def get_configurable(config: Optional[RunnableConfig], key: str) -> Any:
+    """Value injected under config["configurable"][key]; None when absent or when no config was passed."""
+    if not config:
+        return None
+    return (config.get("configurable") or {}).get(key)
@@ -4,9 +4,30 @@ All agents read and write this state; checkpoints persist it for human-in-the-lo
 """
 
 import operator
-from typing import Annotated, Any, Optional, TypedDict
-
-from pydantic import BaseModel, Field
+from typing import Annotated, Any, NamedTuple, Optional, TypedDict
+
+from pydantic import BaseModel, Field, field_serializer, field_validator
+
+
+def _to_records(record_cls, model_cls, values) -> list:
+    """
+    Coerce records, positional tuples, dicts or API models into compact records.
+    Anything that is not already a record is validated through its API model first,
+    so bad input raises ValidationError instead of being stored unchecked.
+    """
+    records = []
+    for v in values or []:
+        if isinstance(v, record_cls):
+            records.append(v)
+            continue
+        if not isinstance(v, (BaseModel, dict)):
+            if len(v) > len(record_cls._fields):
+                raise ValueError(f"{record_cls.__name__} takes at most {len(record_cls._fields)} fields, got {len(v)}")
+            v = dict(zip(record_cls._fields, v))
+        if isinstance(v, dict):
+            v = model_cls(**v)
+        records.append(record_cls(**v.model_dump()))
+    return records
 
 
 class ParsedIntent(BaseModel):
@@ -21,6 +42,7 @@ class ParsedIntent(BaseModel):
     num_days: Optional[int] = None
     travel_style: Optional[str] = None  # solo_backpacking, family, luxury, weekend, etc.
     interests: list[str] = Field(default_factory=list)
+    interests_defaulted: bool = False  # True when the user stated none and interests are the default pair
     constraints: list[str] = Field(default_factory=list)
 
 
@@ -38,6 +60,23 @@ class FlightOption(BaseModel):
     is_demo: bool = False
 
 
+class FlightRecord(NamedTuple):
+    """Compact in-state form of FlightOption; converted to the model only at the API boundary."""
+
+    origin: str
+    destination: str
+    departure: str
+    arrival: str
+    carrier: Optional[str] = None
+    price: Optional[float] = None
+    currency: str = "INR"
+    booking_link: Optional[str] = None
+    is_demo: bool = False
+
+    def to_model(self) -> FlightOption:
+        return FlightOption(**self._asdict())
+
+
 class HotelOption(BaseModel):
     """A single hotel option with pricing and link."""
 
@@ -52,6 +91,23 @@ class HotelOption(BaseModel):
     is_demo: bool = False
 
 
+class HotelRecord(NamedTuple):
+    """Compact in-state form of HotelOption."""
+
+    name: str
+    address: Optional[str] = None
+    price_per_night: Optional[float] = None
+    currency: str = "INR"
+    rating: Optional[float] = None
+    booking_link: Optional[str] = None
+    map_link: Optional[str] = None
+    contact: Optional[str] = None
+    is_demo: bool = False
+
+    def to_model(self) -> HotelOption:
+        return HotelOption(**self._asdict())
+
+
 class ActivityOption(BaseModel):
     """An activity or place to visit."""
 
@@ -66,6 +122,23 @@ class ActivityOption(BaseModel):
     is_demo: bool = False
 
 
+class ActivityRecord(NamedTuple):
+    """Compact in-state form of ActivityOption."""
+
+    name: str
+    type: Optional[str] = None
+    duration_minutes: Optional[int] = None
+    price: Optional[float] = None
+    currency: str = "INR"
+    opening_hours: Optional[str] = None
+    booking_link: Optional[str] = None
+    map_link: Optional[str] = None
+    is_demo: bool = False
+
+    def to_model(self) -> ActivityOption:
+        return ActivityOption(**self._asdict())
+
+
 class WeatherInfo(BaseModel):
     """Weather summary for the destination/dates."""
 
@@ -78,15 +151,61 @@ class WeatherInfo(BaseModel):
 
 
 class ResearchedData(BaseModel):
-    """Aggregated data from the Research Agent."""
+    """Aggregated data from the Research Agent. Options are held as compact records."""
 
-    flights: list[FlightOption] = Field(default_factory=list)
-    hotels: list[HotelOption] = Field(default_factory=list)
-    activities: list[ActivityOption] = Field(default_factory=list)
+    flights: list[FlightRecord] = Field(default_factory=list)
+    hotels: list[HotelRecord] = Field(default_factory=list)
+    activities: list[ActivityRecord] = Field(default_factory=list)
     weather: list[WeatherInfo] = Field(default_factory=list)
     local_tips: list[str] = Field(default_factory=list)
     raw_notes: Optional[str] = None
 
+    @field_validator("flights", mode="before")
+    @classmethod
+    def _flight_records(cls, v):
+        return _to_records(FlightRecord, FlightOption, v)
+
+    @field_validator("hotels", mode="before")
+    @classmethod
+    def _hotel_records(cls, v):
+        return _to_records(HotelRecord, HotelOption, v)
+
+    @field_validator("activities", mode="before")
+    @classmethod
+    def _activity_records(cls, v):
+        return _to_records(ActivityRecord, ActivityOption, v)
+
+    @field_serializer("flights", "hotels", "activities")
+    def _dump_records(self, records: list) -> list[dict[str, Any]]:
+        return [r._asdict() for r in records]
+
+
+class DestinationResearch(BaseModel):
+    """Research result for one shortlisted destination (one parallel research branch)."""
+
+    destination: str
+    researched_data: ResearchedData
+
+
+class DestinationScore(BaseModel):
+    """How well a shortlisted destination fits the parsed intent; higher score ranks first."""
+
+    destination: str
+    score: float
+    estimated_cost: float
+    budget_fit: float
+    interest_fit: float
+    currency: str = "INR"
+
+
+def merge_destination_research(
+    existing: Optional[list[DestinationResearch]], new: Optional[list[DestinationResearch]]
+) -> list[DestinationResearch]:
+    """Reducer: parallel branches append; an empty update clears the list once a destination is approved."""
+    if not new:
+        return []
+    return (existing or []) + new
+
 
 class BudgetAllocation(BaseModel):
     """Proposed budget split across categories."""
@@ -114,14 +233,40 @@ class DayItem(BaseModel):
     currency: str = "INR"
 
 
+class DayItemRecord(NamedTuple):
+    """Compact in-state form of DayItem; same field order, so time has no default (pass None)."""
+
+    time: Optional[str]
+    title: str
+    duration_minutes: Optional[int] = None
+    description: Optional[str] = None
+    location: Optional[str] = None
+    map_link: Optional[str] = None
+    booking_link: Optional[str] = None
+    price: Optional[float] = None
+    currency: str = "INR"
+
+    def to_model(self) -> DayItem:
+        return DayItem(**self._asdict())
+
+
 class DayPlan(BaseModel):
     """One day of the itinerary."""
 
     day: int
     date: Optional[str] = None
-    items: list[DayItem] = Field(default_factory=list)
+    items: list[DayItemRecord] = Field(default_factory=list)
     travel_notes: Optional[str] = None
 
+    @field_validator("items", mode="before")
+    @classmethod
+    def _item_records(cls, v):
+        return _to_records(DayItemRecord, DayItem, v)
+
+    @field_serializer("items")
+    def _dump_items(self, items: list[DayItemRecord]) -> list[dict[str, Any]]:
+        return [i._asdict() for i in items]
+
 
 class BookingOption(BaseModel):
     """Booking-ready option (flight/hotel/activity) with links."""
@@ -136,6 +281,22 @@ class BookingOption(BaseModel):
     currency: str = "INR"
 
 
+class BookingRecord(NamedTuple):
+    """Compact in-state form of BookingOption."""
+
+    type: str
+    label: str
+    details: Optional[dict[str, Any]] = None  # a dict default would be shared by every record
+    booking_link: Optional[str] = None
+    map_link: Optional[str] = None
+    contact: Optional[str] = None
+    price: Optional[float] = None
+    currency: str = "INR"
+
+    def to_model(self) -> BookingOption:
+        return BookingOption(**{**self._asdict(), "details": self.details or {}})
+
+
 class DecisionLogEntry(BaseModel):
     """Single entry in the transparency decision log."""
 
@@ -151,6 +312,7 @@ class TravelPlanState(BaseModel):
     user_input: str = ""
     parsed_intent: Optional[ParsedIntent] = None
     destination_shortlist: list[str] = Field(default_factory=list)
+    ranked_destinations: list[DestinationScore] = Field(default_factory=list)
     researched_data: Optional[ResearchedData] = None
     budget_allocation: Optional[BudgetAllocation] = None
     approved_budget: Optional[BudgetAllocation] = None
@@ -170,11 +332,13 @@ class GraphState(TypedDict, total=False):
     user_input: str
     parsed_intent: Optional[ParsedIntent]
     destination_shortlist: list[str]
+    destination_research: Annotated[list[DestinationResearch], merge_destination_research]
+    ranked_destinations: list[DestinationScore]
     researched_data: Optional[ResearchedData]
     budget_allocation: Optional[BudgetAllocation]
     approved_budget: Optional[BudgetAllocation]
     day_by_day_itinerary: list[DayPlan]
-    booking_options: list[BookingOption]
+    booking_options: list[BookingRecord]
     decision_log: Annotated[list[DecisionLogEntry], operator.add]
     current_checkpoint: Optional[str]
     error_message: Optional[str]
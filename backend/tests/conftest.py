@@ -0,0 +1,21 @@
+"""Tests import backend modules the way the app does (run from backend/: python -m pytest)."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """TestClient with the app lifespan running; background warming off so tests are deterministic."""
+    from fastapi.testclient import TestClient
+
+    from main import app
+
+    monkeypatch.setenv("WARM_ENABLED", "0")
+    monkeypatch.delenv("NODE_POOL_SIZE", raising=False)
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,102 @@
+"""Approvals name the checkpoint they approve; retries never advance the plan twice."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+USER_INPUT = "Goa trip from Delhi for 3 days under 20k"
+
+
+def _start(client) -> dict:
+    body = client.post("/api/plan", json={"user_input": USER_INPUT}).json()
+    assert body["status"] == "awaiting_approval"
+    assert body["interrupt"][0]["checkpoint"] == "destination_shortlist"
+    return body
+
+
+def _pending(client, thread_id: str) -> str:
+    snapshot = client.app.state.graph.get_state({"configurable": {"thread_id": thread_id}})
+    return snapshot.tasks[0].interrupts[0].value["checkpoint"]
+
+
+def test_sequential_retry_without_key_replays_first_result(client):
+    thread_id = _start(client)["thread_id"]
+    body = {"resume": True, "checkpoint": "destination_shortlist"}
+
+    first = client.post(f"/api/plan/{thread_id}/approve", json=body)
+    retry = client.post(f"/api/plan/{thread_id}/approve", json=body)
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.json() == first.json()
+    assert first.json()["interrupt"][0]["checkpoint"] == "budget_allocation"
+    assert _pending(client, thread_id) == "budget_allocation"
+
+
+def test_retry_after_cached_result_expired_is_rejected(client):
+    thread_id = _start(client)["thread_id"]
+    body = {"resume": True, "checkpoint": "destination_shortlist"}
+    client.post(f"/api/plan/{thread_id}/approve", json=body)
+    client.app.state.approvals._done.clear()  # as if the 5-minute ttl had passed
+
+    retry = client.post(f"/api/plan/{thread_id}/approve", json=body)
+
+    assert retry.status_code == 409
+    assert retry.json()["detail"] == {
+        "error": "stale_checkpoint",
+        "checkpoint": "destination_shortlist",
+        "awaiting": "budget_allocation",
+    }
+    assert _pending(client, thread_id) == "budget_allocation"
+
+
+def test_client_key_still_checked_against_pending_checkpoint(client):
+    thread_id = _start(client)["thread_id"]
+    url = f"/api/plan/{thread_id}/approve"
+    client.post(url, json={"resume": True, "checkpoint": "destination_shortlist", "idempotency_key": "a"})
+
+    retry = client.post(url, json={"resume": True, "checkpoint": "destination_shortlist", "idempotency_key": "b"})
+
+    assert retry.status_code == 409
+    assert _pending(client, thread_id) == "budget_allocation"
+
+
+def test_body_without_checkpoint_approves_pending_step(client):
+    thread_id = _start(client)["thread_id"]
+    url = f"/api/plan/{thread_id}/approve"
+
+    first = client.post(url, json={"resume": True})
+    second = client.post(url, json={"resume": True})
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["interrupt"][0]["checkpoint"] == "budget_allocation"
+    assert second.json()["interrupt"][0]["checkpoint"] == "final_itinerary"
+
+
+def test_concurrent_duplicates_run_the_graph_once(client, monkeypatch):
+    thread_id = _start(client)["thread_id"]
+    graph = client.app.state.graph
+    resumed = []
+    ainvoke = graph.ainvoke
+
+    async def slow_ainvoke(*args, **kwargs):
+        resumed.append(True)
+        await asyncio.sleep(0.1)  # keep the first run in flight while the duplicates arrive
+        return await ainvoke(*args, **kwargs)
+
+    monkeypatch.setattr(graph, "ainvoke", slow_ainvoke)
+    body = {"resume": True, "checkpoint": "destination_shortlist"}
+    with ThreadPoolExecutor(4) as pool:
+        responses = list(pool.map(lambda _: client.post(f"/api/plan/{thread_id}/approve", json=body), range(4)))
+
+    assert [r.status_code for r in responses] == [200] * 4
+    assert all(r.json() == responses[0].json() for r in responses)
+    assert len(resumed) == 1
+    assert _pending(client, thread_id) == "budget_allocation"
+
+
+def test_full_journey(client):
+    thread_id = _start(client)["thread_id"]
+    url = f"/api/plan/{thread_id}/approve"
+    for checkpoint in ("destination_shortlist", "budget_allocation", "final_itinerary"):
+        response = client.post(url, json={"resume": True, "checkpoint": checkpoint})
+        assert response.status_code == 200
+    assert response.json()["status"] == "complete"
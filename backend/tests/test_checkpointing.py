@@ -0,0 +1,47 @@
+"""TripStateSerializer: round trips, and older blobs decode by field name or are rejected, never shifted."""
+
+import ormsgpack
+import pytest
+
+from checkpointing import TYPE_TAG, SchemaMismatch, TripStateSerializer
+from state import DayItemRecord, DayPlan, FlightRecord, ParsedIntent, ResearchedData
+
+
+def _blob(header: list, value) -> tuple[str, bytes]:
+    return TYPE_TAG, ormsgpack.packb([header, ormsgpack.packb(value)])
+
+
+def _ext(code: int, values: list) -> ormsgpack.Ext:
+    return ormsgpack.Ext(code, ormsgpack.packb(values))
+
+
+def test_round_trip_state_values():
+    serde = TripStateSerializer(compress_threshold=64)
+    intent = ParsedIntent(budget_total=20000.0, destination="Goa", num_days=3, interests=["beach"])
+    researched = ResearchedData(flights=[FlightRecord(origin="Delhi", destination="Goa", departure="06:00", arrival="07:15", price=2500.0)])
+    days = [DayPlan(day=1, items=[DayItemRecord(time="09:00", title="Beach")])]
+    for value in (intent, researched, days, {"a": [1, "x", None]}):
+        assert serde.loads_typed(serde.dumps_typed(value)) == value
+
+
+def test_blob_written_before_a_field_was_added_uses_the_default():
+    # Stored without num_days and the fields after it
+    stored = ["budget_total", "currency", "origin", "destination"]
+    intent = TripStateSerializer().loads_typed(_blob([[1, stored]], _ext(1, [15000.0, "INR", "Delhi", "Goa"])))
+    assert intent.destination == "Goa"
+    assert intent.num_days is None
+    assert intent.interests == []
+
+
+def test_blob_with_removed_and_reordered_fields_maps_by_name():
+    stored = ["destination", "legacy_score", "origin"]
+    intent = TripStateSerializer().loads_typed(_blob([[1, stored]], _ext(1, ["Goa", 0.9, "Delhi"])))
+    assert (intent.origin, intent.destination) == ("Delhi", "Goa")
+    assert not hasattr(intent, "legacy_score")
+
+
+def test_blob_lacking_a_required_field_is_rejected():
+    record_fields = ["time", "duration_minutes"]  # no title
+    with pytest.raises(SchemaMismatch):
+        TripStateSerializer().loads_typed(_blob([[13, record_fields]], _ext(13, ["09:00", 60])))
+
@@ -0,0 +1,179 @@
+"""ProviderClient retry and hedging against httpx.MockTransport."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from http_client import ProviderClient, create_provider_client
+
+
+def _client(handler, **kwargs):
+    return create_provider_client(
+        base_url="http://provider.test", http2=False, transport=httpx.MockTransport(handler), **kwargs
+    )
+
+
+async def _call(client, method, *args, **kwargs):
+    client._backoff = lambda attempt: 0.0  # keep tests fast
+    try:
+        return await getattr(client, method)(*args, **kwargs)
+    finally:
+        await client.aclose()
+
+
+def test_get_retries_transient_status_then_succeeds():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503 if len(calls) < 3 else 200, json={"ok": True})
+
+    response = asyncio.run(_call(_client(handler, max_retries=2), "get", "/forecast"))
+    assert response.status_code == 200
+    assert len(calls) == 3
+
+
+def test_get_returns_last_retryable_response_when_retries_exhausted():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(502)
+
+    response = asyncio.run(_call(_client(handler, max_retries=1), "get", "/forecast"))
+    assert response.status_code == 502
+    assert len(calls) == 2
+
+
+def test_get_retries_read_timeout():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ReadTimeout("slow", request=request)
+        return httpx.Response(200)
+
+    response = asyncio.run(_call(_client(handler), "get", "/forecast"))
+    assert response.status_code == 200
+    assert len(calls) == 2
+
+
+def test_post_not_retried_after_request_was_sent():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ReadTimeout("slow", request=request)
+
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(_call(_client(handler), "post", "/bookings", json={"hotel": "x"}))
+    assert len(calls) == 1
+
+
+def test_post_not_retried_on_gateway_timeout():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(504)
+
+    response = asyncio.run(_call(_client(handler), "post", "/bookings"))
+    assert response.status_code == 504
+    assert len(calls) == 1
+
+
+def test_post_retried_on_connect_error():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(201)
+
+    response = asyncio.run(_call(_client(handler), "post", "/bookings"))
+    assert response.status_code == 201
+    assert len(calls) == 2
+
+
+def test_post_retry_unsafe_opt_in():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ReadTimeout("slow", request=request)
+        return httpx.Response(201)
+
+    response = asyncio.run(_call(_client(handler), "post", "/bookings", retry_unsafe=True))
+    assert response.status_code == 201
+    assert len(calls) == 2
+
+
+def test_hedged_get_returns_second_copy_when_first_is_slow():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            await asyncio.sleep(2.0)
+            return httpx.Response(200, json={"copy": 1})
+        return httpx.Response(200, json={"copy": 2})
+
+    started = time.perf_counter()
+    response = asyncio.run(_call(_client(handler, hedge_after=0.05), "get", "/forecast"))
+    assert response.json() == {"copy": 2}
+    assert len(calls) == 2
+    assert time.perf_counter() - started < 1.0
+
+
+def test_hedged_get_skips_second_copy_when_first_is_fast():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200)
+
+    asyncio.run(_call(_client(handler, hedge_after=0.5), "get", "/forecast"))
+    assert len(calls) == 1
+
+
+def test_hedged_get_uses_surviving_copy_when_one_fails():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            await asyncio.sleep(0.1)
+            raise httpx.ReadError("reset", request=request)
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, json={"copy": 2})
+
+    response = asyncio.run(_call(_client(handler, hedge_after=0.05, max_retries=0), "get", "/forecast"))
+    assert response.json() == {"copy": 2}
+
+
+class _Body(httpx.AsyncByteStream):
+    def __init__(self):
+        self.closed = False
+
+    async def __aiter__(self):
+        yield b"{}"
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_discard_closes_response_of_losing_copy():
+    body = _Body()
+
+    async def run():
+        loser = asyncio.ensure_future(asyncio.sleep(0, result=httpx.Response(200, stream=body)))
+        await asyncio.sleep(0.01)  # the losing copy has already finished
+        await ProviderClient._discard([loser])
+
+    asyncio.run(run())
+    assert body.closed
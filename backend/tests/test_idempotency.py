@@ -0,0 +1,54 @@
+"""ApprovalDeduplicator: one resume per key, whatever happens to the request that started it."""
+
+import asyncio
+
+from idempotency import ApprovalDeduplicator
+
+
+def test_cancelled_first_caller_does_not_cancel_joined_duplicate():
+    async def scenario():
+        approvals = ApprovalDeduplicator()
+        calls = []
+
+        async def resume():
+            calls.append(True)
+            await asyncio.sleep(0.05)
+            return {"status": "awaiting_approval"}
+
+        first = asyncio.create_task(approvals.run("t", "k", resume))
+        await asyncio.sleep(0)  # first caller starts the resume
+        duplicate = asyncio.create_task(approvals.run("t", "k", resume))
+        await asyncio.sleep(0.01)
+        first.cancel()  # client timeout or disconnect
+
+        result = await duplicate
+        replay = await approvals.run("t", "k", resume)
+        return first, result, replay, calls
+
+    first, result, replay, calls = asyncio.run(scenario())
+
+    assert first.cancelled()
+    assert result == replay == {"status": "awaiting_approval"}
+    assert len(calls) == 1
+
+
+def test_failure_is_shared_by_joined_callers_but_not_cached():
+    async def scenario():
+        approvals = ApprovalDeduplicator()
+        calls = []
+
+        async def resume():
+            calls.append(True)
+            await asyncio.sleep(0.01)
+            if len(calls) == 1:
+                raise RuntimeError("graph failed")
+            return "ok"
+
+        results = await asyncio.gather(*(approvals.run("t", "k", resume) for _ in range(3)), return_exceptions=True)
+        return results, await approvals.run("t", "k", resume), calls
+
+    results, retry, calls = asyncio.run(scenario())
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert retry == "ok"
+    assert len(calls) == 2
@@ -0,0 +1,88 @@
+"""Tiered intent parsing: rule confidence decides escalation; the model tier is cached and micro-batched."""
+
+import asyncio
+
+from agents.intent import needs_escalation, parse_intent, rule_extract
+from agents.intent_model import FakeIntentBackend, IntentModel
+
+CLEAR = "Solo trip to Rishikesh from Delhi under ₹15,000 for 4 days, adventure and yoga"
+VAGUE = "I want to see the backwaters and eat seafood"
+
+
+def _parse(text, model):
+    return asyncio.run(parse_intent({"user_input": text}, {"configurable": {"intent_model": model}}))
+
+
+def _log(update):
+    return update["decision_log"][0].data
+
+
+def test_clear_input_never_calls_backend():
+    backend = FakeIntentBackend()
+
+    update = _parse(CLEAR, IntentModel(backend))
+
+    assert backend.batches == []
+    assert _log(update)["tier"] == "rules"
+    assert update["parsed_intent"].destination == "Rishikesh"
+
+
+def test_absent_fields_do_not_escalate_but_ambiguous_ones_do():
+    assert not needs_escalation(rule_extract("Coorg coffee estates weekend"))
+    assert not needs_escalation(rule_extract("Something spiritual, maybe Varanasi?"))
+    assert needs_escalation(rule_extract("I want to go somewhere in the hills under 20k"))
+    assert needs_escalation(rule_extract(VAGUE))
+
+
+def test_origin_is_extracted_before_the_next_clause():
+    fields = rule_extract("5 day trip to Goa from Mumbai under 30000")
+
+    assert fields["origin"].value == "Mumbai"
+    assert fields["origin"].confidence >= 0.9
+    assert not needs_escalation(fields)
+
+
+def test_multi_word_unknown_destination_is_low_confidence():
+    fields = rule_extract("I want to go somewhere in the hills under 20k")
+
+    assert fields["destination"].confidence < 0.6
+
+
+def test_repeated_input_is_a_cache_hit():
+    backend = FakeIntentBackend({VAGUE: {"destination": "Alleppey"}})
+    model = IntentModel(backend)
+
+    first = _parse(VAGUE, model)
+    second = _parse("i want to see the backwaters, and eat seafood!", model)
+
+    assert backend.batches == [1]
+    assert model.hits == 1
+    assert first["parsed_intent"].destination == second["parsed_intent"].destination == "Alleppey"
+    assert _log(second)["tier"] == "model"
+
+
+def test_concurrent_misses_reach_backend_as_one_batch():
+    texts = [f"somewhere quiet with {n} friends" for n in range(5)]
+    backend = FakeIntentBackend({t: {"destination": "Munnar"} for t in texts}, latency=0.01)
+    model = IntentModel(backend, batch_window=0.05)
+
+    async def burst():
+        return await asyncio.gather(*(model.extract(t) for t in texts + texts[:2]))
+
+    results = asyncio.run(burst())
+
+    assert backend.batches == [5]
+    assert all(r == {"destination": "Munnar"} for r in results)
+
+
+def test_backend_failure_falls_back_to_rules():
+    class FailingBackend:
+        async def extract_batch(self, texts):
+            raise RuntimeError("model unavailable")
+
+    update = _parse("5 day trip to the backwaters from Kochi under 30000", IntentModel(FailingBackend()))
+
+    assert _log(update)["tier"] == "rules_model_failed"
+    parsed = update["parsed_intent"]
+    assert (parsed.origin, parsed.budget_total, parsed.num_days) == ("Kochi", 30000.0, 5)
+    assert parsed.destination == "Alleppey"  # first of the backwaters shortlist
@@ -0,0 +1,64 @@
+"""NodePool: a worker crash fails only the node whose input causes it; offloaded nodes keep their warm inputs."""
+
+import asyncio
+import os
+import time
+
+from agents.planner import plan_itinerary, warm_skeleton
+from graph import OFFLOADABLE_NODES
+from offload import NodeCrashed, NodePool
+from state import DayItemRecord, DayPlan, ParsedIntent
+from warmup import WarmCache
+
+
+def crash_on_poison(state):
+    """Kills its worker for the poison destination; otherwise works slowly enough to be in flight."""
+    if state["parsed_intent"].destination == "poison":
+        os._exit(1)
+    time.sleep(0.5)
+    return {"destination": state["parsed_intent"].destination}
+
+
+def _state(destination):
+    return {"parsed_intent": ParsedIntent(destination=destination)}
+
+
+def test_crash_fails_only_the_crashing_node():
+    async def scenario():
+        pool = NodePool(2, niceness=0)
+        await pool.start()
+        try:
+            healthy = asyncio.ensure_future(pool.run(crash_on_poison, _state("Goa")))
+            await asyncio.sleep(0.1)  # healthy node is running when its pool breaks
+            poisoned = await asyncio.gather(pool.run(crash_on_poison, _state("poison")), return_exceptions=True)
+            after = await pool.run(crash_on_poison, _state("Manali"))
+            return await healthy, poisoned[0], after, pool.restarts
+        finally:
+            pool.shutdown()
+
+    healthy, poisoned, after, restarts = asyncio.run(scenario())
+
+    assert healthy == {"destination": "Goa"}
+    assert isinstance(poisoned, NodeCrashed)
+    assert after == {"destination": "Manali"}
+    assert restarts == 1
+
+
+def test_offloaded_planner_uses_warm_skeleton():
+    warm = WarmCache()
+    skeleton = [DayPlan(day=1, items=[DayItemRecord(time="07:00", title="Warm sunrise walk")])]
+    warm.put_skeleton("Goa", 1, skeleton)
+    state = {"parsed_intent": ParsedIntent(destination="Goa", num_days=1), "decision_log": []}
+
+    async def scenario():
+        pool = NodePool(1, niceness=0)
+        await pool.start()
+        try:
+            node = pool.node("planner", plan_itinerary, reads=OFFLOADABLE_NODES["planner"], inputs=warm_skeleton)
+            return await node(state, {"configurable": {"warm_cache": warm}})
+        finally:
+            pool.shutdown()
+
+    update = asyncio.run(scenario())
+
+    assert update["day_by_day_itinerary"] == skeleton
@@ -0,0 +1,99 @@
+"""Profiled nodes never fail a run: one profiler at a time, overlapping nodes record wall time only."""
+
+import asyncio
+import threading
+
+import profiling
+from profiling import RunProfile, profiled_node
+
+
+def _config(profile):
+    return {"configurable": {"profile": profile}}
+
+
+def _busy(n: int = 20_000) -> int:
+    return sum(i * i for i in range(n))
+
+
+def test_overlapping_async_nodes_profile_one_and_time_the_other():
+    async def slow_node(state):
+        _busy()
+        await asyncio.sleep(0.05)
+        _busy()
+        return {"n": state["n"]}
+
+    node = profiled_node("slow", slow_node)
+    profile = RunProfile("t", "create_plan")
+
+    async def run():
+        return await asyncio.gather(node({"n": 1}, _config(profile)), node({"n": 2}, _config(profile)))
+
+    assert asyncio.run(run()) == [{"n": 1}, {"n": 2}]
+    assert sorted(n.stats is not None for n in profile.nodes) == [False, True]
+    assert profile.stats() is not None
+    assert [n["profiled"] for n in profile.summary()["nodes"]].count(True) == 1
+    assert not profiling._profiler_slot.locked()
+
+
+def test_sync_node_in_thread_overlapping_async_node():
+    started = threading.Event()
+    release = threading.Event()
+
+    def sync_node(state):
+        started.set()
+        release.wait(2)
+        return {"sync": _busy()}
+
+    async def async_node(state):
+        return {"async": _busy()}
+
+    profile = RunProfile("t", "approve")
+    sync_wrapped = profiled_node("sync", sync_node)
+    async_wrapped = profiled_node("async", async_node)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        pending = loop.run_in_executor(None, sync_wrapped, {}, _config(profile))
+        await loop.run_in_executor(None, started.wait, 2)
+        result = await async_wrapped({}, _config(profile))
+        release.set()
+        return result, await pending
+
+    async_result, sync_result = asyncio.run(run())
+    assert "async" in async_result and "sync" in sync_result
+    by_node = {n.node: n for n in profile.nodes}
+    assert by_node["sync"].stats is not None
+    assert by_node["async"].stats is None  # skipped while the sync node held the profiler
+    assert not profiling._profiler_slot.locked()
+
+
+def test_profiler_that_cannot_start_does_not_fail_the_node(monkeypatch):
+    class BusyProfile:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+        def disable(self):
+            pass
+
+    monkeypatch.setattr(profiling.cProfile, "Profile", BusyProfile)
+    profile = RunProfile("t", "create_plan")
+
+    assert profiled_node("sync", lambda state: {"ok": 1})({}, _config(profile)) == {"ok": 1}
+
+    async def async_node(state):
+        await asyncio.sleep(0)
+        return {"ok": 2}
+
+    assert asyncio.run(profiled_node("async", async_node)({}, _config(profile))) == {"ok": 2}
+    assert [n.stats for n in profile.nodes] == [None, None]
+    assert profile.stats() is None
+    assert not profiling._profiler_slot.locked()
+
+
+def test_non_ascii_admin_token_is_rejected_not_a_server_error(client, monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    headers = {"X-Admin-Token": "sécret".encode("latin-1"), "X-Profile": "1"}
+
+    assert client.get("/api/admin/profiles/none", headers=headers).status_code == 403
+    assert client.post("/api/plan", json={"user_input": "Goa trip"}, headers=headers).status_code == 200
+    assert client.get("/api/admin/profiles/none", headers={"X-Admin-Token": "secret"}).status_code == 200
@@ -0,0 +1,51 @@
+"""Destination ranking uses only interests the user stated; unknown places get a neutral profile."""
+
+import asyncio
+
+from agents.intent import parse_intent
+from agents.ranking import UNKNOWN_INTEREST_FIT, score_destination
+from agents.research import build_demo_research, destination_profile
+from state import DestinationResearch, ParsedIntent
+
+
+def _score(destination: str, intent: ParsedIntent):
+    research = DestinationResearch(destination=destination, researched_data=build_demo_research("Delhi", destination))
+    return score_destination(research, intent)
+
+
+def _intent(text: str) -> ParsedIntent:
+    return asyncio.run(parse_intent({"user_input": text}, None))["parsed_intent"]
+
+
+def test_default_interests_do_not_favour_any_destination():
+    intent = _intent("somewhere in the hills under 20k")
+    assert intent.interests_defaulted
+    fits = {d: _score(d, intent).interest_fit for d in ("Manali", "Rishikesh", "Shimla", "Darjeeling")}
+    assert set(fits.values()) == {1.0}
+
+
+def test_stated_interests_rank_matching_places_higher():
+    intent = _intent("hills trip for adventure under 20k")
+    assert not intent.interests_defaulted
+    assert _score("Manali", intent).interest_fit == 1.0
+    assert _score("Shimla", intent).interest_fit == 0.0
+
+
+def test_unknown_destination_is_neutral():
+    assert destination_profile("Ziro")[0] == []
+    stated = ParsedIntent(interests=["adventure", "spiritual"])
+    assert _score("Ziro", stated).interest_fit == UNKNOWN_INTEREST_FIT
+    assert _score("Ziro", ParsedIntent(interests=["adventure"], interests_defaulted=True)).interest_fit == 1.0
+
+
+def test_ties_go_to_the_cheaper_destination():
+    from agents.ranking import rank_destinations
+
+    intent = _intent("somewhere in the hills under 20k")
+    results = [
+        DestinationResearch(destination=d, researched_data=build_demo_research("Delhi", d))
+        for d in ("Manali", "Rishikesh", "Shimla", "Darjeeling")
+    ]
+    ranked = rank_destinations({"parsed_intent": intent, "destination_research": results})["ranked_destinations"]
+    assert [s.destination for s in ranked][0] == "Shimla"  # lowest price multiplier of the four
+    assert [s.estimated_cost for s in ranked] == sorted(s.estimated_cost for s in ranked)
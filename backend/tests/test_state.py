@@ -0,0 +1,65 @@
+"""Compact state records: same field order as their API models, validated on the way in, no shared mutable defaults."""
+
+import pytest
+from pydantic import ValidationError
+
+from state import (
+    ActivityOption,
+    ActivityRecord,
+    BookingOption,
+    BookingRecord,
+    DayItem,
+    DayItemRecord,
+    DayPlan,
+    FlightOption,
+    FlightRecord,
+    HotelOption,
+    HotelRecord,
+    ResearchedData,
+)
+
+
+def test_record_fields_match_model_order():
+    for record_cls, model_cls in (
+        (FlightRecord, FlightOption),
+        (HotelRecord, HotelOption),
+        (ActivityRecord, ActivityOption),
+        (DayItemRecord, DayItem),
+        (BookingRecord, BookingOption),
+    ):
+        assert record_cls._fields == tuple(model_cls.model_fields)
+
+
+def test_positional_day_items_map_to_model_fields():
+    plan = DayPlan(day=1, items=[("09:00", "Beach walk", 60)])
+    assert plan.items[0].time == "09:00"
+    assert plan.items[0].title == "Beach walk"
+    assert plan.items[0].to_model() == DayItem(time="09:00", title="Beach walk", duration_minutes=60)
+
+
+def test_dict_items_are_validated_through_the_api_model():
+    plan = DayPlan(day=1, items=[{"title": "x"}])
+    assert plan.items == [DayItemRecord(time=None, title="x")]
+
+    with pytest.raises(ValidationError):
+        ResearchedData(flights=[{"origin": "Delhi", "destination": "Goa"}])
+    with pytest.raises(ValidationError):
+        ResearchedData(flights=[{"origin": "Delhi", "destination": "Goa", "departure": "d", "arrival": "a", "price": "abc"}])
+    with pytest.raises(ValidationError):
+        DayPlan(day=1, items=[("09:00",)])
+
+
+def test_api_boundary_dumps_records_through_their_models():
+    from routes import _state_to_dict
+
+    out = _state_to_dict({"booking_options": [BookingRecord(type="hotel", label="A")]})
+    assert out["booking_options"][0]["details"] == {}
+
+
+def test_booking_details_not_shared():
+    a = BookingRecord(type="hotel", label="A")
+    b = BookingRecord(type="hotel", label="B")
+    assert a.details is None
+    assert a.to_model().details == {}
+    assert a.to_model().details is not b.to_model().details
+
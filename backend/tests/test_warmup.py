@@ -0,0 +1,28 @@
+"""Warm cache: research warmed for the longest trip serves shorter trips with a matching forecast."""
+
+from state import ResearchedData, WeatherInfo
+from warmup import WarmCache
+
+
+def _researched(days):
+    return ResearchedData(weather=[WeatherInfo(location="Goa", date=f"2026-01-0{d + 1}") for d in range(days)])
+
+
+def test_research_forecast_is_cut_to_trip_length():
+    cache = WarmCache()
+    warmed = _researched(7)
+    cache.put_research("Delhi", "Goa", warmed, 7)
+
+    served = cache.get_research("Delhi", "goa", 3)
+
+    assert [w.date for w in served.weather] == ["2026-01-01", "2026-01-02", "2026-01-03"]
+    assert len(warmed.weather) == 7  # the shared cached entry is untouched
+
+
+def test_research_warmed_for_shorter_trip_is_a_miss():
+    cache = WarmCache()
+    cache.put_research("Delhi", "Goa", _researched(5), 5)
+
+    assert cache.get_research("Delhi", "Goa", 7) is None
+    assert cache.get_research("Delhi", "Goa", 5).weather == _researched(5).weather
+    assert (cache.hits, cache.misses) == (1, 1)
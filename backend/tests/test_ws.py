@@ -0,0 +1,151 @@
+"""WebSocket sessions: runs survive a dropped socket, and attach reports or recovers the thread."""
+
+import asyncio
+
+from routes import _stream_run, _run_config
+
+USER_INPUT = "Goa trip from Delhi for 3 days under 20k"
+
+
+def _receive_until(ws, *types):
+    frames = []
+    while True:
+        frame = ws.receive_json()
+        frames.append(frame)
+        if frame["type"] in types:
+            return frames
+
+
+class _DroppingSocket:
+    """Stands in for a WebSocket whose client disconnects after the first frame."""
+
+    def __init__(self, app):
+        self.app = app
+        self.sent = []
+
+    async def send_text(self, text):
+        if self.sent:
+            raise RuntimeError("Cannot call send once a close message has been sent")
+        self.sent.append(text)
+
+
+def test_run_finishes_when_client_disconnects_mid_run(client):
+    app = client.app
+    socket = _DroppingSocket(app)
+    config = _run_config(socket, "plan-dropped")
+
+    result = asyncio.run(_stream_run(socket, {"user_input": USER_INPUT}, config, "create_plan"))
+
+    assert len(socket.sent) == 1
+    assert result["status"] == "awaiting_approval"
+    snapshot = app.state.graph.get_state({"configurable": {"thread_id": "plan-dropped"}})
+    assert snapshot.tasks[0].interrupts[0].value["checkpoint"] == "destination_shortlist"
+    assert "plan-dropped" not in app.state.active_runs
+
+
+def test_attach_recovers_a_stalled_thread(client):
+    graph = client.app.state.graph
+    config = {"configurable": {"thread_id": "plan-stalled"}}
+
+    async def stop_after_first_step():
+        async for _ in graph.astream({"user_input": USER_INPUT}, config=config, stream_mode="updates"):
+            break  # the run dies here, as if the server restarted
+
+    asyncio.run(stop_after_first_step())
+    assert graph.get_state(config).next  # nodes left, no interrupt
+
+    with client.websocket_connect("/api/plan/ws") as ws:
+        ws.send_json({"type": "attach", "thread_id": "plan-stalled"})
+        session = ws.receive_json()
+        assert session["type"] == "session" and session["status"] == "stalled"
+        frames = _receive_until(ws, "interrupt", "complete", "error")
+        assert frames[-1]["type"] == "interrupt"
+        assert {f["node"] for f in frames if f["type"] == "node"} >= {"research", "rank"}
+
+        ws.send_json({"type": "approve", "resume": True, "checkpoint": "destination_shortlist"})
+        assert _receive_until(ws, "interrupt", "error")[-1]["interrupt"][0]["checkpoint"] == "budget_allocation"
+
+
+def test_attach_reports_awaiting_and_complete(client):
+    with client.websocket_connect("/api/plan/ws") as ws:
+        ws.send_json({"type": "start", "user_input": USER_INPUT})
+        thread_id = ws.receive_json()["thread_id"]
+        _receive_until(ws, "interrupt")
+
+    with client.websocket_connect("/api/plan/ws") as ws:
+        ws.send_json({"type": "attach", "thread_id": thread_id})
+        assert ws.receive_json()["status"] == "awaiting_approval"
+        for checkpoint in ("destination_shortlist", "budget_allocation", "final_itinerary"):
+            ws.send_json({"type": "approve", "resume": True, "checkpoint": checkpoint})
+            last = _receive_until(ws, "interrupt", "complete", "error")[-1]
+        assert last["type"] == "complete"
+        ws.send_json({"type": "attach", "thread_id": thread_id})
+        assert ws.receive_json()["status"] == "complete"
+
+
+def test_admin_profiling_toggle_covers_ws_runs(client):
+    client.app.state.profiling_enabled = True
+    with client.websocket_connect("/api/plan/ws") as ws:
+        ws.send_json({"type": "start", "user_input": USER_INPUT})
+        thread_id = ws.receive_json()["thread_id"]
+        _receive_until(ws, "interrupt")
+    runs = client.app.state.profiles.get(thread_id)
+    assert [r.kind for r in runs] == ["create_plan"]
+    assert {n.node for n in runs[0].nodes} >= {"intent", "research", "rank"}
+
+
+class _GaugeSocket:
+    """Records the live-traffic count each time a frame is sent."""
+
+    def __init__(self, app):
+        self.app = app
+        self.seen = []
+
+    async def send_text(self, text):
+        self.seen.append(self.app.state.traffic.in_flight)
+
+
+def test_ws_run_counts_as_live_traffic(client):
+    app = client.app
+    socket = _GaugeSocket(app)
+
+    asyncio.run(_stream_run(socket, {"user_input": USER_INPUT}, _run_config(socket, "plan-gauge"), "create_plan"))
+
+    assert max(socket.seen) >= 1
+    assert app.state.traffic.in_flight == 0
+
+
+def test_bad_frame_gets_error_and_session_stays_usable(client):
+    with client.websocket_connect("/api/plan/ws") as ws:
+        ws.send_text("{not json")
+        assert ws.receive_json() == {"type": "error", "detail": "invalid_json"}
+        ws.send_bytes(b"\x00")
+        assert ws.receive_json() == {"type": "error", "detail": "invalid_json"}
+
+        ws.send_json({"type": "start", "user_input": USER_INPUT})
+        assert ws.receive_json()["type"] == "session"
+        assert _receive_until(ws, "interrupt", "error")[-1]["type"] == "interrupt"
+
+
+def test_graph_failure_is_reported_as_error_frame(client, monkeypatch):
+    async def failing_astream(*args, **kwargs):
+        raise RuntimeError("checkpointer unavailable")
+        yield  # async generator
+
+    monkeypatch.setattr(client.app.state.graph, "astream", failing_astream)
+    with client.websocket_connect("/api/plan/ws") as ws:
+        ws.send_json({"type": "start", "user_input": USER_INPUT})
+        thread_id = ws.receive_json()["thread_id"]
+        assert ws.receive_json() == {"type": "error", "detail": "run_failed", "thread_id": thread_id}
+
+        ws.send_json({"type": "approve", "resume": True})
+        assert ws.receive_json() == {"type": "error", "detail": "not_awaiting_approval"}
+
+
+def test_idle_session_holds_no_run_or_plan_state(client):
+    with client.websocket_connect("/api/plan/ws") as ws:
+        ws.send_json({"type": "start", "user_input": USER_INPUT})
+        ws.receive_json()
+        _receive_until(ws, "interrupt")
+        # Parked at an approval: nothing running, the plan lives only in the checkpointer
+        assert client.app.state.active_runs == {}
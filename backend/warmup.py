@@ -0,0 +1,171 @@
+"""
+Warm cache for popular routes: research results and default itinerary skeletons are precomputed
+at startup and refreshed on a schedule, so the first request for a popular route skips that work.
+Warming yields to live traffic: it runs one route at a time and only while the server is quiet.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+
+from agents.planner import build_day_plans
+from agents.research import collect_research
+from http_client import ProviderClient
+from state import DayPlan, ResearchedData
+
+DEFAULT_ROUTES = [
+    ("Delhi", "Goa"),
+    ("Delhi", "Manali"),
+    ("Delhi", "Rishikesh"),
+    ("Delhi", "Kerala"),
+    ("Delhi", "Jaipur"),
+    ("Delhi", "Shimla"),
+    ("Mumbai", "Goa"),
+]
+DEFAULT_DAYS = [2, 3, 4, 5, 7]
+
+logger = logging.getLogger(__name__)
+
+
+def _key(*parts: str) -> tuple[str, ...]:
+    return tuple(p.strip().lower() for p in parts)
+
+
+class WarmCache:
+    """Precomputed research per (origin, destination) and itinerary skeletons per (destination, days)."""
+
+    def __init__(self, max_age: float = 7200.0):
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        # (origin, destination) -> (stored at, research, trip length it covers)
+        self._research: dict[tuple[str, ...], tuple[float, ResearchedData, int]] = {}
+        self._skeletons: dict[tuple[str, ...], list[DayPlan]] = {}
+
+    def get_research(self, origin: str, destination: str, num_days: int) -> Optional[ResearchedData]:
+        """
+        Cached research if fresh and warmed for at least num_days, with the forecast cut to the trip.
+        Callers share the object and must not mutate it.
+        """
+        entry = self._research.get(_key(origin, destination))
+        if entry is None or time.monotonic() - entry[0] > self.max_age or num_days > entry[2]:
+            self.misses += 1
+            return None
+        self.hits += 1
+        researched = entry[1]
+        if len(researched.weather) > num_days:
+            researched = researched.model_copy(update={"weather": researched.weather[:num_days]})
+        return researched
+
+    def put_research(self, origin: str, destination: str, researched: ResearchedData, num_days: int) -> None:
+        self._research[_key(origin, destination)] = (time.monotonic(), researched, num_days)
+
+    def is_fresh(self, origin: str, destination: str, within: float) -> bool:
+        entry = self._research.get(_key(origin, destination))
+        return entry is not None and time.monotonic() - entry[0] < within
+
+    def get_skeleton(self, destination: str, num_days: int) -> Optional[list[DayPlan]]:
+        return self._skeletons.get(_key(destination, str(num_days)))
+
+    def put_skeleton(self, destination: str, num_days: int, days: list[DayPlan]) -> None:
+        self._skeletons[_key(destination, str(num_days))] = days
+
+
+class TrafficGauge:
+    """Live HTTP requests plus WebSocket graph runs in flight (middleware in main.py, routes._drain_run)."""
+
+    def __init__(self):
+        self.in_flight = 0
+
+
+def parse_routes(value: Optional[str]) -> list[tuple[str, str]]:
+    """'Delhi:Goa,Mumbai:Goa' -> [("Delhi", "Goa"), ("Mumbai", "Goa")]; defaults when unset."""
+    if not value:
+        return list(DEFAULT_ROUTES)
+    routes = []
+    for pair in value.split(","):
+        origin, _, destination = pair.partition(":")
+        if origin.strip() and destination.strip():
+            routes.append((origin.strip(), destination.strip()))
+    return routes
+
+
+class WarmupJob:
+    """
+    Background job that fills a WarmCache for the configured routes, then refreshes every interval.
+    Controls so it never competes with live traffic:
+      - one route at a time, with a pause between routes;
+      - waits while more than max_live_requests live requests are in flight;
+      - skips routes refreshed within the last interval.
+    """
+
+    def __init__(
+        self,
+        cache: WarmCache,
+        gauge: TrafficGauge,
+        client: Optional[ProviderClient] = None,
+        *,
+        routes: Optional[list[tuple[str, str]]] = None,
+        days: Optional[list[int]] = None,
+        interval: float = 3600.0,
+        pause: float = 0.05,
+        max_live_requests: int = 0,
+        poll: float = 0.5,
+    ):
+        self.cache = cache
+        self.gauge = gauge
+        self.client = client
+        self.routes = routes if routes is not None else list(DEFAULT_ROUTES)
+        self.days = days or list(DEFAULT_DAYS)
+        self.interval = interval
+        self.pause = pause
+        self.max_live_requests = max_live_requests
+        self.poll = poll
+
+    @classmethod
+    def from_env(cls, cache: WarmCache, gauge: TrafficGauge, client: Optional[ProviderClient]) -> "WarmupJob":
+        """WARM_ROUTES, WARM_DAYS, WARM_INTERVAL_SECONDS, WARM_MAX_LIVE_REQUESTS."""
+        days = [int(d) for d in os.getenv("WARM_DAYS", "").split(",") if d.strip().isdigit()]
+        return cls(
+            cache,
+            gauge,
+            client,
+            routes=parse_routes(os.getenv("WARM_ROUTES")),
+            days=days or None,
+            interval=float(os.getenv("WARM_INTERVAL_SECONDS", "3600")),
+            max_live_requests=int(os.getenv("WARM_MAX_LIVE_REQUESTS", "0")),
+        )
+
+    async def _wait_for_quiet(self) -> None:
+        while self.gauge.in_flight > self.max_live_requests:
+            await asyncio.sleep(self.poll)
+
+    async def warm_once(self) -> int:
+        """Refresh stale routes; returns how many routes were computed."""
+        warmed = 0
+        for destination in {d for _, d in self.routes}:
+            for num_days in self.days:
+                if self.cache.get_skeleton(destination, num_days) is None:
+                    self.cache.put_skeleton(destination, num_days, build_day_plans(destination, num_days))
+        for origin, destination in self.routes:
+            if self.cache.is_fresh(origin, destination, within=self.interval):
+                continue
+            await self._wait_for_quiet()
+            # One fetch covers every warmed trip length; get_research trims the forecast per trip
+            longest = max(self.days)
+            researched, _ = await collect_research(origin, destination, longest, self.client)
+            self.cache.put_research(origin, destination, researched, longest)
+            warmed += 1
+            await asyncio.sleep(self.pause)
+        return warmed
+
+    async def run_forever(self) -> None:
+        """Warm at startup, then every interval; errors on one pass never stop the schedule."""
+        while True:
+            try:
+                await self.warm_once()
+            except Exception:  # warming is best-effort; live requests compute on a miss
+                logger.exception("Warm-up pass failed")
+            await asyncio.sleep(self.interval)
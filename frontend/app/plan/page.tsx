@@ -72,7 +72,11 @@ export default function PlanPage() {
 
   async function handleApprove() {
     const threadId = result?.thread_id;
-    if (!threadId || result?.status !== "awaiting_approval") return;
+    if (!threadId || result?.status !== "awaiting_approval" || loading) return;
+    // Naming the checkpoint makes double clicks and retries idempotent: the backend runs it once
+    // and rejects an approval for a checkpoint the plan has already passed
+    const checkpoint = (result.interrupt?.[0] as { checkpoint?: string } | undefined)?.checkpoint;
+    if (!checkpoint) return;
     setError(null);
     setLoading(true);
     try {
@@ -80,7 +84,7 @@ export default function PlanPage() {
       const res = await fetch(url, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ resume: true }),
+        body: JSON.stringify({ resume: true, checkpoint }),
       });
       if (!res.ok) {
         const text = await res.text();